@@ -0,0 +1,147 @@
+# Kaan Kara - 220404046
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterator, List
+
+import numpy as np
+
+from lower_bound import held_karp_bound
+from telemetry import TelemetryWriter
+from tsp_genetic_algorithm import TSPData, GeneticAlgorithm
+
+
+def iter_instance_paths(targets: List[str]) -> List[str]:
+    # Dizin verilirse içindeki tüm .tsp dosyaları, aksi halde glob deseni
+    paths = []
+    for target in targets:
+        if os.path.isdir(target):
+            paths.extend(sorted(glob.glob(os.path.join(target, "*.tsp"))))
+        else:
+            paths.extend(sorted(glob.glob(target)))
+    return list(dict.fromkeys(paths))
+
+
+def solve_instance(path: str, max_generations: int = 100, time_budget: float = None, population_size: int = 100,
+                   seed: int = None, use_local_search: bool = False, include_tour: bool = False,
+                   checkpoint_dir: str = None, telemetry_dir: str = None, with_bound: bool = False,
+                   target_gap: float = None) -> dict:
+    start = time.perf_counter()
+    result = {'file': path}
+    try:
+        tsp_data = TSPData(path)
+        ga = GeneticAlgorithm(tsp_data, population_size=population_size, seed=seed)
+        telemetry = None
+        if telemetry_dir:
+            telemetry = TelemetryWriter(os.path.join(telemetry_dir, os.path.basename(path) + ".telemetry.jsonl"))
+            ga.add_callback(telemetry)
+
+        # Hata olsa da telemetri dosyası kapatılır (yarım kalan JSONL satırı/tanıtıcı sızıntısı olmasın)
+        try:
+            # Kontrol noktası varsa (ör. kesilen bir işten) kaldığı yerden devam edilir
+            checkpoint = None
+            if checkpoint_dir:
+                checkpoint = os.path.join(checkpoint_dir, os.path.basename(path) + ".ckpt.npz")
+                if os.path.exists(checkpoint):
+                    ga.resume(checkpoint)
+
+            # Held-Karp alt sınırı: fark raporu ve target_gap ile erken durdurma (süre bütçesinin en fazla %20'si)
+            bound = None
+            if with_bound or target_gap is not None:
+                bound = held_karp_bound(tsp_data, time_budget=None if time_budget is None else 0.2 * time_budget)
+                result['lower_bound'] = bound['bound']
+        
+            remaining = None if time_budget is None else max(0.0, time_budget - (time.perf_counter() - start))
+            ga.run(max_generations=max_generations, stagnation_limit=sys.maxsize, verbose=False,
+                   use_local_search=use_local_search, time_budget=remaining, checkpoint_path=checkpoint,
+                   lower_bound=None if bound is None else bound['bound'], target_gap=target_gap)
+        finally:
+            if telemetry is not None:
+                telemetry.close()
+
+        best = ga.best_chromosome.get_total_distance()
+        result.update({
+            'name': tsp_data.name,
+            'cities': tsp_data.dimension,
+            'generations': ga.generation,
+            'initial': ga.best_history[0],
+            'best': best,
+            # improvement: sezgisel başlangıca göre (GA kazancı), random_improvement: rastgele turlara göre (%)
+            'random_baseline': ga.random_baseline(),
+            'improvement': ga.improvement(),
+            'random_improvement': ga.random_improvement(),
+            'gap': None if bound is None else ga.gap() * 100,
+            'seconds': time.perf_counter() - start,
+        })
+        if include_tour:
+            result['tour'] = tsp_data.to_city_ids(ga.best_chromosome.genes)
+    except Exception as exc:
+        # Tek bir bozuk dosya tüm toplu çalışmayı durdurmamalı
+        result.update({'error': f"{type(exc).__name__}: {exc}", 'seconds': time.perf_counter() - start})
+    return result
+
+
+def solve_batch(paths: List[str], workers: int = None, max_generations: int = 100, time_budget: float = None,
+                population_size: int = 100, seed: int = None, use_local_search: bool = False,
+                include_tour: bool = False, checkpoint_dir: str = None,
+                telemetry_dir: str = None, with_bound: bool = False, target_gap: float = None) -> Iterator[dict]:
+    # Sonuçlar örnekler bittikçe (tamamlanma sırasıyla) döner
+    seeds = [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(seed).spawn(len(paths))]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(solve_instance, path, max_generations, time_budget, population_size,
+                               instance_seed, use_local_search, include_tour, checkpoint_dir, telemetry_dir,
+                               with_bound, target_gap)
+                   for path, instance_seed in zip(paths, seeds)]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Birden çok TSPLIB örneğini paralel çözer, sonuçları JSONL yazar")
+    parser.add_argument("targets", nargs="+", help="Dizin veya glob deseni (ör. 'instances/*.tsp')")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--generations", type=int, default=100)
+    parser.add_argument("--time-budget", type=float, default=None, help="Örnek başına saniye")
+    parser.add_argument("--population", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--local-search", action="store_true")
+    parser.add_argument("--with-tour", action="store_true", help="En iyi turu (şehir numaraları) da yaz")
+    parser.add_argument("--output", default="-", help="JSONL çıktı dosyası (varsayılan: stdout)")
+    parser.add_argument("--checkpoint-dir", default=None,
+                        help="Örnek başına kontrol noktası dizini; yeniden çalıştırmada kaldığı yerden devam eder")
+    parser.add_argument("--telemetry-dir", default=None, help="Örnek başına nesil telemetrisi (JSONL) dizini")
+    parser.add_argument("--lower-bound", action="store_true",
+                        help="Held-Karp alt sınırını hesapla, sonuca alt sınır ve fark (%%) ekle")
+    parser.add_argument("--target-gap", type=float, default=None,
+                        help="Alt sınıra bu göreli farka (ör. 0.02) inince dur; --lower-bound'u içerir")
+    args = parser.parse_args()
+
+    paths = iter_instance_paths(args.targets)
+    if not paths:
+        parser.error("Hiç .tsp dosyası bulunamadı")
+    for directory in (args.checkpoint_dir, args.telemetry_dir):
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        for result in solve_batch(paths, workers=args.workers, max_generations=args.generations,
+                                  time_budget=args.time_budget, population_size=args.population,
+                                  seed=args.seed, use_local_search=args.local_search,
+                                  include_tour=args.with_tour, checkpoint_dir=args.checkpoint_dir,
+                                  telemetry_dir=args.telemetry_dir, with_bound=args.lower_bound,
+                                  target_gap=args.target_gap):
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+# Kaan Kara - 220404046
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import time
+import timeit
+from concurrent.futures import ProcessPoolExecutor
+from statistics import median
+from typing import Dict, List
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:
+    # Windows: tepe bellek ölçülemez
+    resource = None
+
+from tsp_genetic_algorithm import TSPData, GeneticAlgorithm
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# TSPLIB bilinen en iyi tur uzunlukları
+KNOWN_OPTIMA: Dict[str, int] = {
+    "berlin52": 7542,
+    "att48": 10628,
+    "a280": 2579,
+    "att532": 27686,
+}
+
+# (metrik, yön): +1 büyük olan iyi, -1 küçük olan iyi
+COMPARED_METRICS = (
+    ("gens_per_sec", +1),
+    ("evals_per_sec", +1),
+    ("peak_rss_mb", -1),
+)
+
+
+def _peak_rss_mb() -> float:
+    if resource is None:
+        return None
+    # Linux'ta KB, macOS'ta bayt
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2 ** 20
+
+
+def _run_case(path: str, optimum: float, seed: int, generations: int, population_size: int,
+              use_local_search: bool, targets: List[float]) -> dict:
+    # Her durum taze bir süreçte çalışır: tepe bellek yalnızca bu örneği ölçer
+    start = time.perf_counter()
+    tsp_data = TSPData(path, use_cache=False)
+    reached = {gap: None for gap in targets}
+
+    def on_generation(stats: dict):
+        for gap in targets:
+            if reached[gap] is None and stats['best'] <= optimum * (1 + gap):
+                reached[gap] = time.perf_counter() - start
+
+    ga = GeneticAlgorithm(tsp_data, population_size=population_size, seed=seed, on_generation=on_generation)
+    ga.initialize_population(verbose=False)
+    ga_start = time.perf_counter()
+    ga.run(max_generations=generations, stagnation_limit=sys.maxsize, verbose=False)
+    ga_seconds = time.perf_counter() - ga_start
+    ga_best = ga.best_chromosome.get_total_distance()
+
+    if use_local_search:
+        ga.best_chromosome = ga.three_opt(ga.best_chromosome)
+    best = ga.best_chromosome.get_total_distance()
+    for gap in targets:
+        if reached[gap] is None and best <= optimum * (1 + gap):
+            reached[gap] = time.perf_counter() - start
+
+    return {
+        'seed': seed,
+        'generations': ga.generation,
+        'gens_per_sec': ga.generation / ga_seconds,
+        'evals_per_sec': (ga.evaluations + ga.delta_evaluations) / ga_seconds,
+        'ga_best': ga_best,
+        'best': best,
+        'final_gap': (best - optimum) / optimum,
+        'time_to_target': {f"{gap:g}": seconds for gap, seconds in reached.items()},
+        'seconds': time.perf_counter() - start,
+        'phase_ms': {phase: value * 1000 / max(1, ga.generation) for phase, value in ga.timer.total.items()},
+        'peak_rss_mb': _peak_rss_mb(),
+    }
+
+
+def run_instances(instances: List[str], seeds: List[int], generations: int, population_size: int,
+                  use_local_search: bool, targets: List[float]) -> Dict[str, dict]:
+    results = {}
+    context = multiprocessing.get_context("spawn")
+    # Zamanlamalar birbirini etkilemesin diye durumlar sırayla, her biri ayrı süreçte çalışır
+    with ProcessPoolExecutor(max_workers=1, mp_context=context, max_tasks_per_child=1) as pool:
+        for name in instances:
+            path = os.path.join(HERE, f"{name}.tsp")
+            optimum = KNOWN_OPTIMA[name]
+            runs = [pool.submit(_run_case, path, optimum, seed, generations, population_size, use_local_search,
+                                targets).result()
+                    for seed in seeds]
+            time_to_target = {}
+            for gap in runs[0]['time_to_target']:
+                times = [r['time_to_target'][gap] for r in runs]
+                # Hedefe ulaşamayan tohum varsa medyan tanımsız
+                time_to_target[gap] = median(times) if all(t is not None for t in times) else None
+            rss = [r['peak_rss_mb'] for r in runs if r['peak_rss_mb'] is not None]
+            results[name] = {
+                'optimum': optimum,
+                'runs': runs,
+                'summary': {
+                    'gens_per_sec': median(r['gens_per_sec'] for r in runs),
+                    'evals_per_sec': median(r['evals_per_sec'] for r in runs),
+                    'final_gap': float(np.mean([r['final_gap'] for r in runs])),
+                    'time_to_target': time_to_target,
+                    'peak_rss_mb': max(rss) if rss else None,
+                },
+            }
+    return results
+
+
+def _micro(func, number: int, repeat: int = 5) -> float:
+    # Çağrı başına en iyi süre (µs)
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+
+
+def run_micro_benchmarks() -> Dict[str, float]:
+    sys.path.insert(0, os.path.dirname(HERE))
+    sys.path.insert(0, os.path.join(os.path.dirname(HERE), "assignment-2"))
+    from eight_queens import count_conflicts
+    from fitness import calculate_fitness
+
+    rng = np.random.default_rng(0)
+    tsp_data = TSPData(os.path.join(HERE, "att532.tsp"), use_cache=False)
+    ga = GeneticAlgorithm(tsp_data, seed=0, seeding={})
+    ga.initialize_population(verbose=False)
+    parent1, parent2 = ga.population.chromosome(0), ga.population.chromosome(1)
+    city_ids = tsp_data.city_ids.tolist()
+    pairs = [(city_ids[i], city_ids[j]) for i, j in rng.integers(0, len(city_ids), size=(1000, 2))]
+    queens = [(rng.permutation(8) + 1).tolist() for _ in range(100)]
+
+    def distances():
+        for a, b in pairs:
+            tsp_data.calculate_distance(a, b)
+
+    def conflicts():
+        for genotype in queens:
+            count_conflicts(genotype)
+
+    def fitness():
+        for genotype in queens:
+            calculate_fitness(genotype)
+
+    return {
+        'calculate_distance': _micro(distances, 20) / len(pairs),
+        'cycle_crossover (tek çift)': _micro(lambda: ga.cycle_crossover(parent1, parent2), 200),
+        'crossover (tüm nesil)': _micro(lambda: ga.crossover(ga.population.genes[::2], ga.population.genes[1::2],
+                                                             ga.rng, tsp_data), 50),
+        'two_opt (att532, rastgele tur)': _micro(lambda: ga.two_opt(parent1), 3, repeat=3),
+        'create_next_generation (att532)': _micro(ga.create_next_generation, 20),
+        'eight_queens.count_conflicts': _micro(conflicts, 200) / len(queens),
+        'fitness.calculate_fitness (8 vezir)': _micro(fitness, 200) / len(queens),
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float, gap_tolerance: float,
+            micro_threshold: float = 0.25) -> List[str]:
+    # Gerilemeler: hız/bellek için göreli eşik, kalite (optimuma uzaklık) için mutlak tolerans
+    regressions = []
+    for name, result in current.get('instances', {}).items():
+        base = baseline.get('instances', {}).get(name)
+        if base is None:
+            continue
+        now, old = result['summary'], base['summary']
+        for metric, direction in COMPARED_METRICS:
+            if now.get(metric) is None or old.get(metric) is None:
+                continue
+            change = (now[metric] - old[metric]) / old[metric]
+            if direction * change < -threshold:
+                regressions.append(f"{name}.{metric}: {old[metric]:.4g} -> {now[metric]:.4g} ({change:+.1%})")
+        if now['final_gap'] - old['final_gap'] > gap_tolerance:
+            regressions.append(f"{name}.final_gap: {old['final_gap']:.2%} -> {now['final_gap']:.2%}")
+
+    for name, micros in current.get('micro', {}).items():
+        old = baseline.get('micro', {}).get(name)
+        if old is not None and (micros - old) / old > micro_threshold:
+            regressions.append(f"micro.{name}: {old:.2f} µs -> {micros:.2f} µs ({(micros - old) / old:+.1%})")
+    return regressions
+
+
+def print_report(results: dict):
+    instances = results.get('instances', {})
+    if instances:
+        targets = next(iter(instances.values()))['summary']['time_to_target']
+        header = f"{'Örnek':<10} {'nesil/sn':>9} {'değ./sn':>10} {'fark':>7} {'bellek MB':>10} " + \
+                 " ".join(f"{'≤%' + format(float(g) * 100, 'g'):>7}" for g in targets)
+        print(header)
+        print("-" * len(header))
+        for name, result in instances.items():
+            s = result['summary']
+            rss = "-" if s['peak_rss_mb'] is None else f"{s['peak_rss_mb']:.1f}"
+            ttt = " ".join("-".rjust(7) if t is None else f"{t:>6.2f}s" for t in s['time_to_target'].values())
+            print(f"{name:<10} {s['gens_per_sec']:>9.1f} {s['evals_per_sec']:>10.0f} {s['final_gap']:>7.2%} {rss:>10} {ttt}")
+
+    if results.get('micro'):
+        print()
+        for name, micros in results['micro'].items():
+            print(f"{name:<40} {micros:>12.2f} µs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Paketteki TSPLIB örnekleri üzerinde tekrarlanabilir hız/kalite ölçümü")
+    parser.add_argument("--instances", nargs="+", default=list(KNOWN_OPTIMA), choices=list(KNOWN_OPTIMA))
+    parser.add_argument("--seeds", nargs="+", type=int, default=[0, 1, 2])
+    parser.add_argument("--generations", type=int, default=200)
+    parser.add_argument("--population", type=int, default=100)
+    parser.add_argument("--local-search", action="store_true")
+    parser.add_argument("--targets", nargs="+", type=float, default=[0.10, 0.05, 0.02],
+                        help="Optimuma göre hedef farklar (time-to-target)")
+    parser.add_argument("--skip-runs", action="store_true", help="Yalnızca mikro-benchmark")
+    parser.add_argument("--skip-micro", action="store_true")
+    parser.add_argument("--output", default=None, help="Sonuçların yazılacağı JSON (ör. baseline.json)")
+    parser.add_argument("--compare", default=None, help="Karşılaştırılacak taban JSON; gerileme varsa çıkış kodu 1")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Hız/bellek için göreli gerileme eşiği")
+    parser.add_argument("--gap-tolerance", type=float, default=0.005, help="Optimuma farkta mutlak tolerans")
+    parser.add_argument("--micro-threshold", type=float, default=0.25,
+                        help="Mikro-benchmark için göreli eşik (kısa ölçümler daha gürültülü)")
+    args = parser.parse_args()
+
+    results = {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'generations': args.generations,
+            'population': args.population,
+            'seeds': args.seeds,
+            'local_search': args.local_search,
+        },
+    }
+    if not args.skip_runs:
+        results['instances'] = run_instances(args.instances, args.seeds, args.generations, args.population,
+                                             args.local_search, args.targets)
+    if not args.skip_micro:
+        results['micro'] = run_micro_benchmarks()
+
+    print_report(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.gap_tolerance, args.micro_threshold)
+        print()
+        if regressions:
+            print("GERİLEME:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("Gerileme yok")
+
+
+if __name__ == "__main__":
+    main()
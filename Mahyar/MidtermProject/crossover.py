@@ -0,0 +1,178 @@
+# Kaan Kara - 220404046
+
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+
+# Tüm operatörler (B x N) ebeveyn matrisleri üzerinde toplu çalışır ve (çocuk1, çocuk2) döndürür
+CrossoverOperator = Callable[[np.ndarray, np.ndarray, np.random.Generator, object], Tuple[np.ndarray, np.ndarray]]
+
+
+def _positions(genes: np.ndarray) -> np.ndarray:
+    # pos[b, şehir] = şehrin b. turdaki indeksi (ebeveyn çifti başına bir kez kurulur)
+    batch, size = genes.shape
+    pos = np.empty_like(genes)
+    pos[np.arange(batch)[:, None], genes] = np.arange(size)
+    return pos
+
+
+def _cut_points(rng: np.random.Generator, batch: int, size: int) -> Tuple[np.ndarray, np.ndarray]:
+    # [start, end) segmenti, en az bir gen
+    start = rng.integers(0, size, size=(batch, 1))
+    end = start + 1 + np.floor(rng.random((batch, 1)) * (size - start)).astype(np.int64)
+    return start, end
+
+
+def cycle_crossover(parents1: np.ndarray, parents2: np.ndarray, rng: np.random.Generator = None,
+                    tsp_data=None) -> Tuple[np.ndarray, np.ndarray]:
+    batch, size = parents1.shape
+    rows = np.arange(batch)[:, None]
+    positions = np.arange(size)
+
+    # parents1.index(value) yerine konum tablosu: döngüde bir sonraki pozisyon O(1)
+    nxt = _positions(parents1)[rows, parents2]
+
+    # Pointer doubling: her pozisyon, ait olduğu döngünün en küçük indeksiyle etiketlenir (log N vektörel adım)
+    label = np.tile(positions, (batch, 1))
+    jump = nxt
+    for _ in range(max(1, int(size).bit_length())):
+        label = np.minimum(label, label[rows, jump])
+        jump = jump[rows, jump]
+
+    cycle_len = np.zeros(batch * size, dtype=np.int64)
+    np.add.at(cycle_len, (label + rows * size).ravel(), 1)
+    cycle_len = cycle_len.reshape(batch, size)[rows, label]
+
+    # Döngü başlangıcından önceki tüm pozisyonlar ziyaret edilmiştir: cycle_num = start // len(cycle)
+    swap = (label // cycle_len) % 2 == 1
+    child1 = np.where(swap, parents2, parents1)
+    child2 = np.where(swap, parents1, parents2)
+    return child1, child2
+
+
+def _order_child(keep: np.ndarray, fill: np.ndarray, start: np.ndarray, end: np.ndarray) -> np.ndarray:
+    batch, size = keep.shape
+    rows = np.arange(batch)[:, None]
+
+    # Üyelik bitmap'i: segmentteki şehirler
+    in_segment = np.zeros((batch, size), dtype=bool)
+    seg_positions = np.arange(size)[None, :]
+    seg_mask = (seg_positions >= start) & (seg_positions < end)
+    in_segment[rows, keep] = seg_mask
+
+    # Segment sonrasından başlayarak dairesel sırayla diğer ebeveynin kalan şehirleri
+    rotated = (end + np.arange(size)[None, :]) % size
+    fill_rot = fill[rows, rotated]
+    order = np.argsort(in_segment[rows, fill_rot], axis=1, kind="stable")
+    remaining = fill_rot[rows, order]
+
+    child = keep.copy()
+    outside = np.arange(size)[None, :] < (size - (end - start))
+    child[rows, rotated] = np.where(outside, remaining, keep[rows, rotated])
+    return child
+
+
+def order_crossover(parents1: np.ndarray, parents2: np.ndarray, rng: np.random.Generator,
+                    tsp_data=None) -> Tuple[np.ndarray, np.ndarray]:
+    start, end = _cut_points(rng, *parents1.shape)
+    return _order_child(parents1, parents2, start, end), _order_child(parents2, parents1, start, end)
+
+
+def _pmx_child(keep: np.ndarray, fill: np.ndarray, start: np.ndarray, end: np.ndarray) -> np.ndarray:
+    batch, size = keep.shape
+    rows = np.arange(batch)[:, None]
+    positions = np.arange(size)[None, :]
+    seg_mask = (positions >= start) & (positions < end)
+
+    in_segment = np.zeros((batch, size), dtype=bool)
+    in_segment[rows, keep] = seg_mask
+    pos_keep = _positions(keep)
+
+    # Çakışan şehirler eşleme zinciriyle çözülür: v -> fill[pos_keep[v]], segment dışındaki şehirlerde sabit.
+    # Zincir sonu pointer doubling ile log N vektörel adımda bulunur
+    cities = np.tile(np.arange(size), (batch, 1))
+    mapping = np.where(in_segment, fill[rows, pos_keep], cities)
+    for _ in range(max(1, int(size).bit_length())):
+        mapping = mapping[rows, mapping]
+    return np.where(seg_mask, keep, mapping[rows, fill])
+
+
+def pmx_crossover(parents1: np.ndarray, parents2: np.ndarray, rng: np.random.Generator,
+                  tsp_data=None) -> Tuple[np.ndarray, np.ndarray]:
+    start, end = _cut_points(rng, *parents1.shape)
+    return _pmx_child(parents1, parents2, start, end), _pmx_child(parents2, parents1, start, end)
+
+
+def _edge_assembly_child(adjacency: list, fallback: list, start_city: int, dist, neighbors) -> list:
+    size = len(fallback)
+    visited = [False] * size
+    child = [start_city]
+    visited[start_city] = True
+    cursor = 0
+    current = start_city
+
+    for _ in range(size - 1):
+        options = adjacency[current]
+        best = -1
+        best_key = None
+        # Önce iki ebeveynde ortak olan kenarlar, sonra en kısa ebeveyn kenarı
+        for city in set(options):
+            if visited[city]:
+                continue
+            key = (-options.count(city), dist(current, city))
+            if best_key is None or key < best_key:
+                best, best_key = city, key
+
+        if best < 0:
+            for city in neighbors[current]:
+                if not visited[city]:
+                    best = city
+                    break
+        if best < 0:
+            while visited[fallback[cursor]]:
+                cursor += 1
+            best = fallback[cursor]
+
+        visited[best] = True
+        child.append(best)
+        current = best
+    return child
+
+
+def edge_assembly_crossover(parents1: np.ndarray, parents2: np.ndarray, rng: np.random.Generator,
+                            tsp_data) -> Tuple[np.ndarray, np.ndarray]:
+    # EAX-lite: iki ebeveynin kenar birleşiminden açgözlü tur kurulumu; kopan uçlar komşu listesiyle bağlanır
+    batch, size = parents1.shape
+    dist = tsp_data.distance_function()
+    neighbors = tsp_data.nearest_neighbors(5).tolist()
+    child1 = np.empty_like(parents1)
+    child2 = np.empty_like(parents2)
+
+    for b in range(batch):
+        p1 = parents1[b]
+        p2 = parents2[b]
+        adjacency = np.empty((size, 4), dtype=np.int64)
+        adjacency[p1, 0] = np.roll(p1, 1)
+        adjacency[p1, 1] = np.roll(p1, -1)
+        adjacency[p2, 2] = np.roll(p2, 1)
+        adjacency[p2, 3] = np.roll(p2, -1)
+        adjacency = adjacency.tolist()
+        starts = rng.integers(0, size, size=2)
+        child1[b] = _edge_assembly_child(adjacency, p1.tolist(), int(starts[0]), dist, neighbors)
+        child2[b] = _edge_assembly_child(adjacency, p2.tolist(), int(starts[1]), dist, neighbors)
+    return child1, child2
+
+
+CROSSOVER_OPERATORS: Dict[str, CrossoverOperator] = {
+    "cx": cycle_crossover,
+    "ox": order_crossover,
+    "pmx": pmx_crossover,
+    "eax": edge_assembly_crossover,
+}
+
+
+def get_crossover(name: str) -> CrossoverOperator:
+    if name not in CROSSOVER_OPERATORS:
+        raise ValueError(f"Bilinmeyen çaprazlama: {name} (seçenekler: {', '.join(CROSSOVER_OPERATORS)})")
+    return CROSSOVER_OPERATORS[name]
@@ -0,0 +1,53 @@
+# Kaan Kara - 220404046
+
+import math
+
+import numpy as np
+
+
+def edge_keys(genes: np.ndarray) -> np.ndarray:
+    # Yönsüz kenar kimlikleri min * N + max, (P x N) int64; i. sütun (g[i], g[i+1]) kenarı
+    genes = np.asarray(genes, dtype=np.int64)
+    n = genes.shape[-1]
+    following = np.roll(genes, -1, axis=-1)
+    return np.minimum(genes, following) * n + np.maximum(genes, following)
+
+
+def sampled_edge_distance(genes: np.ndarray, rng: np.random.Generator, samples: int = 32) -> float:
+    # Ortalama ikili kenar uzaklığı (ortak olmayan kenar oranı) rastgele çiftlerle tahmin edilir: O(samples * N).
+    # 0 = popülasyon tek tura çökmüş, rastgele turlarda ~1
+    size, n = genes.shape
+    if size < 2 or n < 3:
+        return 0.0
+    first = rng.integers(0, size, samples)
+    second = (first + rng.integers(1, size, samples)) % size
+    a = genes[first]
+    b = genes[second]
+    # b turlarında her şehrin ardılı ve öncülü; a'nın (g[i], g[i+1]) kenarı b'de varsa ortaktır
+    lines = np.arange(samples)[:, None]
+    successor = np.empty_like(b)
+    predecessor = np.empty_like(b)
+    successor[lines, b] = np.roll(b, -1, axis=1)
+    predecessor[lines, b] = np.roll(b, 1, axis=1)
+    following = np.roll(a, -1, axis=1)
+    shared = (successor[lines, a] == following) | (predecessor[lines, a] == following)
+    return float(1.0 - shared.mean())
+
+
+def edge_entropy(genes: np.ndarray) -> float:
+    # Popülasyondaki yönsüz kenar frekanslarının entropisi: H = log T - sum(c log c) / T (T = toplam kenar).
+    # Doğrudan np.unique ile: her nesilde turların çoğu değiştiği için artımlı sayaç (fark + yama) daha yavaş
+    keys = edge_keys(genes).ravel()
+    if len(keys) == 0:
+        return 0.0
+    counts = np.unique(keys, return_counts=True)[1].astype(np.float64)
+    total = counts.sum()
+    return float(math.log(total) - (counts * np.log(counts)).sum() / total)
+
+
+def normalized_edge_entropy(genes: np.ndarray) -> float:
+    # P turun hepsi aynıysa H = log N, hiç ortak kenar yoksa H = log(P N): (H - log N) / log P, [0, 1]
+    size, n = genes.shape
+    if size < 2 or n < 1:
+        return 0.0
+    return min(1.0, max(0.0, (edge_entropy(genes) - math.log(n)) / math.log(size)))
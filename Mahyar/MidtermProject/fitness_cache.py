@@ -0,0 +1,70 @@
+# Kaan Kara - 220404046
+
+from collections import OrderedDict
+from typing import List
+
+import numpy as np
+
+
+def _mix64(x: np.ndarray, salt: int) -> np.ndarray:
+    # splitmix64 sonlandırıcısı (uint64 taşmaları bilerek sarar)
+    z = x + np.uint64((0x9E3779B97F4A7C15 * salt) & 0xFFFFFFFFFFFFFFFF)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def tour_keys(tours: np.ndarray) -> List[int]:
+    # Tur, kenar kümesiyle özetlenir: her yönsüz kenarın karması toplanır. Toplam döndürme ve yönden
+    # bağımsızdır (kanonik biçime çevirmeye gerek yok), tamamen vektörel; iki bağımsız 64 bit -> 128 bit anahtar
+    tours = np.atleast_2d(tours).astype(np.uint64)
+    size = tours.shape[1]
+    nxt = np.roll(tours, -1, axis=1)
+    edges = np.minimum(tours, nxt) * np.uint64(size) + np.maximum(tours, nxt)
+    with np.errstate(over="ignore"):
+        high = _mix64(edges, 1).sum(axis=1, dtype=np.uint64)
+        low = _mix64(edges, 2).sum(axis=1, dtype=np.uint64)
+    return [(h << 64) | l for h, l in zip(high.tolist(), low.tolist())]
+
+
+class FitnessCache:
+    # Sınırlı LRU: anahtar -> tur uzunluğu; isabet/ıska sayaçları dışarıdan okunabilir
+
+    def __init__(self, capacity: int = 4096):
+        self.capacity = capacity
+        self.entries: "OrderedDict[int, float]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def lookup(self, keys: List[int]) -> np.ndarray:
+        # Iska olan konumlar NaN
+        values = np.full(len(keys), np.nan)
+        for i, key in enumerate(keys):
+            value = self.entries.get(key)
+            if value is None:
+                self.misses += 1
+                continue
+            self.entries.move_to_end(key)
+            values[i] = value
+            self.hits += 1
+        return values
+
+    def store(self, keys: List[int], values: np.ndarray):
+        for key, value in zip(keys, values.tolist()):
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
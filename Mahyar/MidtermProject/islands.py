@@ -0,0 +1,206 @@
+# Kaan Kara - 220404046
+
+import argparse
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from tsp_genetic_algorithm import TSPData, Chromosome, GeneticAlgorithm, compact_genes
+
+
+logger = logging.getLogger(__name__)
+
+
+TOPOLOGIES = ("ring", "full")
+
+
+class SharedTSPData:
+    # TSPData dizilerini paylaşımlı belleğe kopyalar; işçiler matrisi pickle etmeden bağlanır
+
+    def __init__(self, tsp_data: TSPData):
+        self.blocks: List[shared_memory.SharedMemory] = []
+        self.spec = {
+            'name': tsp_data.name,
+            'edge_weight_type': tsp_data.edge_weight_type,
+            'matrix_limit': tsp_data.matrix_limit,
+            'arrays': {},
+        }
+        arrays = {'city_ids': tsp_data.city_ids, 'coords': tsp_data.coords}
+        if tsp_data.distance_matrix is not None:
+            arrays['distance_matrix'] = tsp_data.distance_matrix
+
+        for key, array in arrays.items():
+            block = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+            self.blocks.append(block)
+            self.spec['arrays'][key] = (block.name, array.shape, array.dtype.str)
+
+    def close(self):
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+    def __enter__(self) -> "SharedTSPData":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def attach_tsp_data(spec: dict):
+    blocks = []
+    arrays = {}
+    for key, (name, shape, dtype) in spec['arrays'].items():
+        block = shared_memory.SharedMemory(name=name)
+        arrays[key] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        blocks.append(block)
+
+    tsp_data = TSPData.from_arrays(spec['name'], spec['edge_weight_type'], arrays['city_ids'], arrays['coords'],
+                                   arrays.get('distance_matrix'), matrix_limit=spec['matrix_limit'])
+    return tsp_data, blocks
+
+
+_worker_tsp_data: Optional[TSPData] = None
+_worker_blocks = []
+
+
+def _init_worker(spec: dict):
+    global _worker_tsp_data, _worker_blocks
+    _worker_tsp_data, _worker_blocks = attach_tsp_data(spec)
+
+
+def _run_island_epoch(state: Optional[dict], population_size: int, seed: int, generations: int,
+                      migration_size: int) -> dict:
+    ga = GeneticAlgorithm(_worker_tsp_data, population_size=population_size, seed=seed)
+    if state is None:
+        ga.initialize_population(verbose=False)
+    else:
+        ga.set_state(state)
+
+    for _ in range(generations):
+        ga.create_next_generation()
+
+    state = ga.get_state()
+    elite_order = np.argsort(state['distances'], kind="stable")[:max(1, migration_size)]
+    state['elite_genes'] = state['genes'][elite_order]
+    state['elite_distances'] = state['distances'][elite_order]
+    return state
+
+
+class IslandModel:
+
+    def __init__(self, tsp_data: TSPData, islands: int = 4, population_size: int = 100,
+                 migration_interval: int = 10, migration_size: int = 2, topology: str = "ring",
+                 workers: int = None, seed: int = None):
+        if topology not in TOPOLOGIES:
+            raise ValueError(f"Bilinmeyen göç topolojisi: {topology} (seçenekler: {', '.join(TOPOLOGIES)})")
+        # 0 olursa her turda 0 nesil ilerlenir ve run hiç bitmez
+        if migration_interval < 1:
+            raise ValueError(f"Göç aralığı en az 1 nesil olmalı: {migration_interval}")
+        self.tsp_data = tsp_data
+        self.islands = islands
+        self.population_size = population_size
+        self.migration_interval = migration_interval
+        self.migration_size = min(migration_size, population_size - 1)
+        self.topology = topology
+        self.workers = workers or min(islands, os.cpu_count() or 1)
+        self.seeds = [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(seed).spawn(islands)]
+        self.generation = 0
+        self.best_chromosome: Chromosome = None
+        self.best_history: List[float] = []
+
+    def _sources(self, island: int) -> List[int]:
+        if self.islands < 2:
+            return []
+        if self.topology == "ring":
+            return [(island - 1) % self.islands]
+        return [i for i in range(self.islands) if i != island]
+
+    def migrate(self, states: List[dict]):
+        # Göçmenler alıcı adanın en kötü bireylerinin yerine geçer
+        incoming: Dict[int, tuple] = {}
+        for island in range(self.islands):
+            sources = self._sources(island)
+            if not sources or self.migration_size == 0:
+                continue
+            genes = np.concatenate([states[s]['elite_genes'] for s in sources])
+            distances = np.concatenate([states[s]['elite_distances'] for s in sources])
+            best = np.argsort(distances, kind="stable")[:self.migration_size]
+            incoming[island] = (genes[best], distances[best])
+
+        for island, (genes, distances) in incoming.items():
+            state = states[island]
+            state['genes'] = state['genes'].copy()
+            state['distances'] = state['distances'].copy()
+            worst = np.argsort(state['distances'], kind="stable")[::-1][:len(genes)]
+            state['genes'][worst] = genes
+            state['distances'][worst] = distances
+
+    def run(self, max_generations: int = 100, verbose: bool = True) -> Chromosome:
+        states: List[Optional[dict]] = [None] * self.islands
+
+        with SharedTSPData(self.tsp_data) as shared, \
+                ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                    initargs=(shared.spec,)) as pool:
+            while self.generation < max_generations:
+                generations = min(self.migration_interval, max_generations - self.generation)
+                futures = [pool.submit(_run_island_epoch, states[i], self.population_size, self.seeds[i],
+                                       generations, self.migration_size)
+                           for i in range(self.islands)]
+                states = [f.result() for f in futures]
+                self.generation += generations
+
+                best_island = min(range(self.islands), key=lambda i: states[i]['elite_distances'][0])
+                best_distance = float(states[best_island]['elite_distances'][0])
+                if self.best_chromosome is None or best_distance < self.best_chromosome.get_total_distance():
+                    self.best_chromosome = Chromosome(compact_genes(states[best_island]['elite_genes'][0]),
+                                                      self.tsp_data, distance=best_distance)
+                self.best_history.append(self.best_chromosome.get_total_distance())
+
+                if verbose:
+                    logger.info("Nesil %d: En İyi Mesafe = %.2f (ada %d)", self.generation,
+                                self.best_chromosome.get_total_distance(), best_island)
+
+                if self.generation < max_generations:
+                    self.migrate(states)
+
+        logger.info("Sonuç: %d ada, %d nesil, En İyi Mesafe: %.2f", self.islands, self.generation,
+                    self.best_chromosome.get_total_distance())
+        return self.best_chromosome
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"en az 1 olmalı: {value}")
+    return number
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Çok çekirdekli ada modeli TSP genetik algoritması")
+    parser.add_argument("tsp_file")
+    parser.add_argument("--islands", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--population", type=int, default=100)
+    parser.add_argument("--generations", type=int, default=200)
+    parser.add_argument("--migration-interval", type=_positive_int, default=10)
+    parser.add_argument("--migration-size", type=int, default=2)
+    parser.add_argument("--topology", choices=TOPOLOGIES, default="ring")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    tsp_data = TSPData(args.tsp_file)
+    model = IslandModel(tsp_data, islands=args.islands, population_size=args.population,
+                        migration_interval=args.migration_interval, migration_size=args.migration_size,
+                        topology=args.topology, workers=args.workers, seed=args.seed)
+    model.run(max_generations=args.generations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# Kaan Kara - 220404046
+
+import numpy as np
+
+
+class KDTree:
+    # Dizi tabanlı 2B KD-ağacı: noktalar yaprak sırasına göre bir permütasyonda tutulur (medyan bölme, O(N log N))
+
+    def __init__(self, points: np.ndarray, leaf_size: int = 32):
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        n = len(self.points)
+        self.order = np.arange(n)
+        leaves = []
+        stack = [(0, n)]
+        while stack:
+            start, end = stack.pop()
+            if end - start <= leaf_size:
+                if end > start:
+                    leaves.append(start)
+                continue
+            idx = self.order[start:end]
+            pts = self.points[idx]
+            axis = int(np.argmax(pts.max(axis=0) - pts.min(axis=0)))
+            mid = (end - start) // 2
+            self.order[start:end] = idx[np.argpartition(pts[:, axis], mid)]
+            # Sol yarı önce işlenir: yapraklar uzayda DFS sırasıyla dizilir
+            stack.append((start + mid, end))
+            stack.append((start, start + mid))
+
+        self.leaf_start = np.array(leaves, dtype=np.int64)
+        self.leaf_end = np.append(self.leaf_start[1:], n)
+        self.sorted_points = self.points[self.order]
+        if n:
+            self.lo = np.minimum.reduceat(self.sorted_points, self.leaf_start, axis=0)
+            self.hi = np.maximum.reduceat(self.sorted_points, self.leaf_start, axis=0)
+        else:
+            self.lo = self.hi = np.empty((0, 2))
+
+    def _leaf_positions(self, leaves: np.ndarray) -> np.ndarray:
+        return np.concatenate([np.arange(self.leaf_start[l], self.leaf_end[l]) for l in leaves])
+
+    def query_all(self, k: int) -> np.ndarray:
+        # Her noktanın (kendisi hariç) k en yakın komşusu, yakından uzağa sıralı
+        n = len(self.points)
+        k = min(k, n - 1)
+        result = np.empty((n, max(k, 0)), dtype=np.int32)
+        if k <= 0:
+            return result
+
+        sizes = self.leaf_end - self.leaf_start
+        for leaf in range(len(self.leaf_start)):
+            start, end = self.leaf_start[leaf], self.leaf_end[leaf]
+            own = self.sorted_points[start:end]
+            gap = np.maximum(0.0, np.maximum(self.lo - self.hi[leaf], self.lo[leaf] - self.hi))
+            box_d2 = (gap * gap).sum(axis=1)
+
+            # Önce en yakın kutulardan (çoğunlukla yaprağın kendisi) k+1 nokta toplanır;
+            # buradaki k. mesafe kesin arama yarıçapını sınırlar
+            if sizes[leaf] > k:
+                candidates = np.arange(start, end)
+            else:
+                near = np.argsort(box_d2, kind="stable")
+                enough = int(np.searchsorted(np.cumsum(sizes[near]), k + 1)) + 1
+                candidates = self._leaf_positions(near[:enough])
+            d2 = ((own[:, None, :] - self.sorted_points[candidates][None, :, :]) ** 2).sum(axis=2)
+            bound = np.partition(d2, k, axis=1)[:, k].max()
+
+            candidates = self._leaf_positions(np.flatnonzero(box_d2 <= bound))
+            d2 = ((own[:, None, :] - self.sorted_points[candidates][None, :, :]) ** 2).sum(axis=2)
+            d2[candidates[None, :] == np.arange(start, end)[:, None]] = np.inf
+
+            nearest = np.argpartition(d2, k - 1, axis=1)[:, :k]
+            order = np.argsort(np.take_along_axis(d2, nearest, axis=1), axis=1, kind="stable")
+            result[self.order[start:end]] = self.order[candidates[np.take_along_axis(nearest, order, axis=1)]]
+        return result
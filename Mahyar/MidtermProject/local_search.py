@@ -0,0 +1,225 @@
+# Kaan Kara - 220404046
+
+import time
+from collections import deque
+from typing import List, Tuple
+
+
+class LocalSearch:
+
+    def __init__(self, tsp_data, neighbor_count: int = 10, max_segment: int = 3):
+        self.tsp_data = tsp_data
+        self.neighbor_count = neighbor_count
+        self.max_segment = max_segment
+        # Her şehir için en yakın K komşu (aday listesi), mesafeye göre sıralı
+        self.neighbors: List[List[int]] = tsp_data.nearest_neighbors(neighbor_count).tolist()
+        self.dist = tsp_data.distance_function()
+
+    @staticmethod
+    def _positions(tour: List[int]) -> List[int]:
+        pos = [0] * len(tour)
+        for idx, city in enumerate(tour):
+            pos[city] = idx
+        return pos
+
+    @staticmethod
+    def _reverse(tour: List[int], pos: List[int], i: int, j: int):
+        # tour[i..j] (ileri yönde, dairesel) ters çevrilir; tümleyen daha kısaysa o çevrilir
+        n = len(tour)
+        length = (j - i) % n + 1
+        if 2 * length > n:
+            i, j = (j + 1) % n, (i - 1) % n
+            length = n - length
+
+        for _ in range(length // 2):
+            a = tour[i]
+            b = tour[j]
+            tour[i] = b
+            pos[b] = i
+            tour[j] = a
+            pos[a] = j
+            i += 1
+            if i == n:
+                i = 0
+            j -= 1
+            if j < 0:
+                j = n - 1
+
+    @staticmethod
+    def _move_segment(tour: List[int], pos: List[int], s1: int, length: int, u: int, v: int, reverse: bool):
+        # tour[pos[s1]..] segmenti (length şehir) u-v kenarının arasına taşınır (v = succ(u))
+        n = len(tour)
+        i = pos[s1]
+        forward_window = length + (pos[u] - i - length) % n + 1
+        backward_window = (i - pos[v]) % n + length
+
+        if forward_window <= backward_window:
+            # [S, nx..u] -> [nx..u, S']
+            idxs = [(i + k) % n for k in range(forward_window)]
+            values = [tour[x] for x in idxs]
+            segment = values[:length]
+            if reverse:
+                segment.reverse()
+            values = values[length:] + segment
+        else:
+            # [v..p, S] -> [S', v..p]
+            start = pos[v]
+            idxs = [(start + k) % n for k in range(backward_window)]
+            values = [tour[x] for x in idxs]
+            segment = values[-length:]
+            if reverse:
+                segment.reverse()
+            values = segment + values[:-length]
+
+        for x, city in zip(idxs, values):
+            tour[x] = city
+            pos[city] = x
+
+    def two_opt(self, tour: List[int], deadline: float = None) -> Tuple[List[int], int]:
+        tour = list(tour)
+        n = len(tour)
+        if n < 4:
+            return tour, 0
+
+        dist = self.dist
+        neighbors = self.neighbors
+        pos = self._positions(tour)
+        # Don't-look bitleri: yalnızca kuyruktaki şehirler için iyileştirme aranır
+        active = deque(tour)
+        queued = [True] * n
+        total_gain = 0
+        checks = 0
+
+        while active:
+            checks += 1
+            if deadline is not None and checks & 255 == 0 and time.perf_counter() > deadline:
+                break
+            a = active.popleft()
+            queued[a] = False
+            touched = None
+
+            for forward in (True, False):
+                i = pos[a]
+                b = tour[i + 1 - n] if forward else tour[i - 1]
+                d_ab = dist(a, b)
+
+                for c in neighbors[a]:
+                    d_ac = dist(a, c)
+                    if d_ac >= d_ab:
+                        break
+
+                    j = pos[c]
+                    d = tour[j + 1 - n] if forward else tour[j - 1]
+                    if d == a or c == b:
+                        continue
+
+                    # (a,b) ve (c,d) kenarları yerine (a,c) ve (b,d): O(1) kazanç
+                    gain = d_ab + dist(c, d) - d_ac - dist(b, d)
+                    if gain > 0:
+                        if forward:
+                            self._reverse(tour, pos, pos[b], pos[c])
+                        else:
+                            self._reverse(tour, pos, pos[a], pos[d])
+                        total_gain += gain
+                        touched = (a, b, c, d)
+                        break
+
+                if touched:
+                    break
+
+            if touched:
+                for city in touched:
+                    if not queued[city]:
+                        queued[city] = True
+                        active.append(city)
+
+        return tour, total_gain
+
+    def or_opt(self, tour: List[int], deadline: float = None) -> Tuple[List[int], int]:
+        tour = list(tour)
+        n = len(tour)
+        if n < self.max_segment + 3:
+            return tour, 0
+
+        dist = self.dist
+        neighbors = self.neighbors
+        pos = self._positions(tour)
+        active = deque(tour)
+        queued = [True] * n
+        total_gain = 0
+        checks = 0
+
+        while active:
+            checks += 1
+            if deadline is not None and checks & 255 == 0 and time.perf_counter() > deadline:
+                break
+            s1 = active.popleft()
+            queued[s1] = False
+            touched = None
+
+            for length in range(1, self.max_segment + 1):
+                i = pos[s1]
+                s2 = tour[(i + length - 1) % n]
+                p = tour[i - 1]
+                nx = tour[(i + length) % n]
+                # Segment çıkarılınca kazanılan: (p,s1) + (s2,nx) - (p,nx)
+                removal_gain = dist(p, s1) + dist(s2, nx) - dist(p, nx)
+                if removal_gain <= 0:
+                    continue
+
+                for end, other in ((s1, s2), (s2, s1)):
+                    for c in neighbors[end]:
+                        d_c = dist(c, end)
+                        if d_c >= removal_gain:
+                            break
+                        if (pos[c] - i) % n < length:
+                            continue
+
+                        j = pos[c]
+                        for u, v, tail in ((c, tour[(j + 1) % n], True), (tour[j - 1], c, False)):
+                            if (pos[u] - i) % n < length or (pos[v] - i) % n < length:
+                                continue
+                            # Eklenen kenarlar: c-end, diğer uç - komşu, eksi (u,v)
+                            if tail:
+                                added = d_c + dist(other, v) - dist(u, v)
+                            else:
+                                added = dist(u, other) + d_c - dist(u, v)
+                            gain = removal_gain - added
+                            if gain > 0:
+                                # u S' v okunuşunda u'nun yanındaki uç s1 değilse segment ters çevrilir
+                                first = end if tail else other
+                                self._move_segment(tour, pos, s1, length, u, v, first != s1)
+                                total_gain += gain
+                                touched = (p, nx, s1, s2, u, v)
+                                break
+                        if touched:
+                            break
+                    if touched:
+                        break
+                if touched:
+                    break
+
+            if touched:
+                for city in touched:
+                    if not queued[city]:
+                        queued[city] = True
+                        active.append(city)
+
+        return tour, total_gain
+
+    def three_opt(self, tour: List[int], time_budget: float = None) -> Tuple[List[int], int]:
+        # 2-opt (segment ters çevirme) ve Or-opt (segment taşıma, ters/düz) yerel optimuma kadar dönüşümlü
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+        total_gain = 0
+        tour, gain = self.two_opt(tour, deadline)
+        total_gain += gain
+
+        while deadline is None or time.perf_counter() < deadline:
+            tour, gain = self.or_opt(tour, deadline)
+            total_gain += gain
+            if gain == 0:
+                break
+            tour, gain = self.two_opt(tour, deadline)
+            total_gain += gain
+
+        return tour, total_gain
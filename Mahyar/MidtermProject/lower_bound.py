@@ -0,0 +1,206 @@
+# Kaan Kara - 220404046
+
+import argparse
+import logging
+import math
+import time
+from typing import List, Tuple
+
+import numpy as np
+
+from local_search import LocalSearch
+from seeding import greedy_edge_tour
+
+
+logger = logging.getLogger(__name__)
+
+# Bitmask DP bellek/süre sınırı: 2^(N-1) x (N-1) tablo
+EXACT_LIMIT = 20
+
+
+def _row_function(tsp_data):
+    # Matris varsa satır okunurken float64'e çevrilir (tüm matrisin kopyası yok), yoksa satır önbellekli hesap
+    if tsp_data.distance_matrix is not None:
+        matrix = tsp_data.distance_matrix
+        return lambda i: matrix[i].astype(np.float64)
+    return lambda i: tsp_data.distance_row(i).astype(np.float64)
+
+
+def prim_mst(row, n: int, pi: np.ndarray, skip: int = None) -> Tuple[float, np.ndarray]:
+    # Ağırlık d(i, j) + pi_i + pi_j; skip düğümü dışındaki düğümlerde MST, dizi tabanlı Prim O(N^2).
+    # Dönüş: (toplam ağırlık, düğüm dereceleri)
+    degrees = np.zeros(n, dtype=np.int64)
+    in_tree = np.zeros(n, dtype=bool)
+    if skip is not None:
+        in_tree[skip] = True
+    root = 1 if skip == 0 else 0
+    in_tree[root] = True
+    key = row(root) + pi[root] + pi
+    key[in_tree] = np.inf
+    parent = np.full(n, root)
+    total = 0.0
+
+    for _ in range(n - 1 - (skip is not None)):
+        v = int(np.argmin(key))
+        total += key[v]
+        degrees[v] += 1
+        degrees[parent[v]] += 1
+        in_tree[v] = True
+        key[v] = np.inf
+        weights = row(v) + pi[v] + pi
+        closer = (weights < key) & ~in_tree
+        key[closer] = weights[closer]
+        parent[closer] = v
+    return total, degrees
+
+
+def one_tree(row, n: int, pi: np.ndarray, special: int = 0) -> Tuple[float, np.ndarray]:
+    # 1-ağaç: special dışındaki düğümlerin MST'si + special'dan en kısa iki kenar.
+    # L(pi) = ağırlık - 2 * sum(pi) her tur uzunluğunun alt sınırıdır
+    total, degrees = prim_mst(row, n, pi, skip=special)
+    weights = row(special) + pi[special] + pi
+    weights[special] = np.inf
+    two = np.argpartition(weights, 1)[:2]
+    total += weights[two].sum()
+    degrees[two] += 1
+    degrees[special] += 2
+    return total - 2 * pi.sum(), degrees
+
+
+def upper_bound_tour(tsp_data) -> float:
+    # Alt gradyan adımı için üst sınır: açgözlü kenar turu + 2-opt/Or-opt (sıkı üst sınır daha iyi adım verir)
+    tour, gain = LocalSearch(tsp_data).three_opt(greedy_edge_tour(tsp_data))
+    return tsp_data.tour_length(tour)
+
+
+def held_karp_bound(tsp_data, upper_bound: float = None, max_iterations: int = 1000,
+                    time_budget: float = None, period: int = None) -> dict:
+    # Held-Karp 1-ağaç alt sınırı, alt gradyan optimizasyonu (Polyak adımı, plato sonrası adım yarılanır).
+    # Tüm dereceler 2 olursa 1-ağaç bir turdur ve sınır optimumdur
+    start = time.perf_counter()
+    deadline = None if time_budget is None else start + time_budget
+    n = tsp_data.dimension
+    if n < 3:
+        length = tsp_data.tour_length(list(range(n))) if n else 0.0
+        return {'bound': length, 'upper_bound': length, 'iterations': 0, 'optimal': True,
+                'seconds': time.perf_counter() - start, 'pi': np.zeros(n)}
+
+    row = _row_function(tsp_data)
+    if upper_bound is None:
+        upper_bound = upper_bound_tour(tsp_data)
+    period = period or max(10, n // 2)
+    pi = np.zeros(n)
+    best, best_pi = -np.inf, pi.copy()
+    step_scale = 2.0
+    stale = 0
+    optimal = False
+    iterations = 0
+
+    while iterations < max_iterations and step_scale > 1e-6:
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+        iterations += 1
+        length, degrees = one_tree(row, n, pi)
+        if length > best + 1e-9:
+            best, best_pi = length, pi.copy()
+            stale = 0
+        else:
+            stale += 1
+            if stale >= period:
+                step_scale /= 2
+                stale = 0
+
+        subgradient = degrees - 2
+        norm = float(subgradient @ subgradient)
+        # TSPLIB uzunlukları tam sayı: ceil(sınır) üst sınıra ulaştıysa tur optimumdur
+        if norm == 0 or math.ceil(best - 1e-6) >= upper_bound:
+            optimal = True
+            break
+        pi += step_scale * (upper_bound - length) / norm * subgradient
+
+    bound = math.ceil(best - 1e-6)
+    logger.info("Held-Karp: %d iterasyon, alt sınır %d, üst sınır %.0f", iterations, bound, upper_bound)
+    return {'bound': float(bound), 'upper_bound': float(upper_bound), 'iterations': iterations,
+            'optimal': optimal, 'seconds': time.perf_counter() - start, 'pi': best_pi}
+
+
+def gap(length: float, bound: float) -> float:
+    # Alt sınıra göreli fark (0.01 = %1); optimuma fark en fazla bu kadardır
+    return (length - bound) / bound if bound > 0 else float('inf')
+
+
+def exact_tour(tsp_data) -> Tuple[List[int], float]:
+    # Held-Karp bitmask DP, O(2^N N^2): dp[mask, k] = 0'dan başlayıp mask kümesini gezip k'da biten en kısa yol.
+    # Aynı büyüklükteki tüm maskeler tek NumPy işlemiyle güncellenir. Yalnızca N <= 20 (doğruluk testleri için)
+    n = tsp_data.dimension
+    if n > EXACT_LIMIT:
+        raise ValueError(f"Kesin çözüm için şehir sayısı çok büyük: {n} (en fazla {EXACT_LIMIT})")
+    if n <= 3:
+        tour = list(range(n))
+        return tour, tsp_data.tour_length(tour) if n else 0.0
+
+    row = _row_function(tsp_data)
+    dist = np.array([row(i) for i in range(n)])
+    m = n - 1
+    # Şehir 0 sabit başlangıç; maskenin j. biti şehir j+1
+    size = 1 << m
+    dp = np.full((size, m), np.inf)
+    choice = np.zeros((size, m), dtype=np.int8)
+    singles = 1 << np.arange(m)
+    dp[singles, np.arange(m)] = dist[0, 1:]
+
+    masks = np.arange(size)
+    popcount = np.zeros(size, dtype=np.int64)
+    for bit in range(m):
+        popcount += (masks >> bit) & 1
+    step = dist[1:, 1:]
+
+    for count in range(2, m + 1):
+        layer = masks[popcount == count]
+        for k in range(m):
+            targets = layer[(layer >> k) & 1 == 1]
+            previous = targets ^ (1 << k)
+            candidates = dp[previous] + step[:, k]
+            best = np.argmin(candidates, axis=1)
+            dp[targets, k] = candidates[np.arange(len(targets)), best]
+            choice[targets, k] = best
+
+    closing = dp[size - 1] + dist[1:, 0]
+    last = int(np.argmin(closing))
+    length = float(closing[last])
+
+    # Geri izleme
+    tour = []
+    mask = size - 1
+    while mask:
+        tour.append(last + 1)
+        previous = int(choice[mask, last])
+        mask ^= 1 << last
+        last = previous
+    tour.append(0)
+    return tour[::-1], length
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    from tsp_genetic_algorithm import TSPData
+
+    parser = argparse.ArgumentParser(description="Held-Karp 1-ağaç alt sınırı (ve N <= 20 için kesin çözüm)")
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--time-budget", type=float, default=None)
+    args = parser.parse_args()
+
+    for path in args.files:
+        tsp_data = TSPData(path)
+        result = held_karp_bound(tsp_data, max_iterations=args.iterations, time_budget=args.time_budget)
+        print(f"{tsp_data.name}: N = {tsp_data.dimension}, alt sınır = {result['bound']:.0f}, "
+              f"üst sınır = {result['upper_bound']:.0f} (fark {gap(result['upper_bound'], result['bound']):.2%}), "
+              f"{result['iterations']} iterasyon, {result['seconds']:.2f} sn")
+        if tsp_data.dimension <= EXACT_LIMIT:
+            tour, length = exact_tour(tsp_data)
+            print(f"  kesin optimum = {length:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# Kaan Kara - 220404046
+
+from collections import deque
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+
+class OperatorScheduler:
+    # Çok kollu haydut tarzı operatör seçimi: her kolun son `window` nesildeki toplam iyileşmesi / CPU saniyesi
+    # (kayan pencereli kredi) olasılık eşleme ile olasılığa çevrilir; her kol en az min_probability alır (keşif)
+
+    def __init__(self, names: Sequence[str], window: int = 20, min_probability: float = 0.05,
+                 initial: Sequence[float] = None):
+        self.names: List[str] = list(names)
+        k = len(self.names)
+        self.min_probability = min(min_probability, 1.0 / k)
+        self.credits = [deque(maxlen=window) for _ in range(k)]
+        initial = np.full(k, 1.0 / k) if initial is None else np.asarray(initial, dtype=np.float64)
+        self.initial = self._with_floor(initial / initial.sum())
+        self.uses = np.zeros(k, dtype=np.int64)
+
+    def _with_floor(self, weights: np.ndarray) -> np.ndarray:
+        k = len(weights)
+        return self.min_probability + (1.0 - k * self.min_probability) * weights / weights.sum()
+
+    def probabilities(self) -> np.ndarray:
+        # Henüz kredisi olmayan kol varsa başlangıç olasılıkları
+        if any(len(credit) == 0 for credit in self.credits):
+            return self.initial
+        rates = np.array([sum(c[0] for c in credit) / max(sum(c[1] for c in credit), 1e-9)
+                          for credit in self.credits])
+        if rates.sum() <= 0:
+            return self.initial
+        return self._with_floor(rates)
+
+    def sample(self, rng: np.random.Generator, count: int) -> np.ndarray:
+        arms = rng.choice(len(self.names), size=count, p=self.probabilities())
+        self.uses += np.bincount(arms, minlength=len(self.names))
+        return arms
+
+    def record(self, arm: int, improvement: float, seconds: float):
+        # Kol bu nesilde kullanılmadıysa kayıt yok: pencere yalnızca gerçek denemelerle kayar
+        self.credits[arm].append((max(0.0, improvement), seconds))
+
+    def credit(self, arms: np.ndarray, gains: np.ndarray, seconds: Sequence[float], shared: float = 0.0):
+        # Nesil sonu toplu kredi: kullanım başına kazançlar kollara toplanır. Her kol kendi operatör süresi +
+        # kullanım başına ortak süre (seçmediği aşamaların payı) kadar CPU ile ödenir
+        k = len(self.names)
+        counts = np.bincount(arms, minlength=k)
+        totals = np.bincount(arms, weights=np.maximum(gains, 0.0), minlength=k)
+        for arm in np.flatnonzero(counts):
+            self.record(int(arm), float(totals[arm]), seconds[arm] + counts[arm] * shared)
+
+    def mix(self) -> Dict[str, float]:
+        return dict(zip(self.names, self.probabilities().tolist()))
+
+    def reset(self):
+        for credit in self.credits:
+            credit.clear()
+        self.uses[:] = 0
@@ -0,0 +1,358 @@
+# Kaan Kara - 220404046
+
+from typing import Callable, Dict, List
+
+import numpy as np
+
+
+# Varsayılan karışım: kalan kısım rastgele turlarla doldurulur (çeşitlilik için)
+DEFAULT_SEEDING: Dict[str, float] = {
+    "nn": 0.05,
+    "greedy": 0.05,
+    "hilbert": 0.05,
+    "christofides": 0.05,
+}
+
+CANDIDATE_COUNT = 10
+
+# Her strateji (tsp_data, adet, rng) -> (adet x N) int32 tur matrisi
+SeedingStrategy = Callable[[object, int, np.random.Generator], np.ndarray]
+
+
+def random_tours(tsp_data, count: int, rng: np.random.Generator) -> np.ndarray:
+    base = np.tile(np.arange(tsp_data.dimension, dtype=np.int32), (count, 1))
+    return rng.permuted(base, axis=1)
+
+
+def _double_bridge(tours: np.ndarray, rng: np.random.Generator, kicks: np.ndarray) -> np.ndarray:
+    # A B C D -> A C B D: yerel aramanın tek hamlede geri alamadığı küçük bir pertürbasyon
+    count, size = tours.shape
+    if size < 8:
+        return tours
+    positions = np.arange(size)[None, :]
+    for kick in range(int(kicks.max(initial=0))):
+        rows = kicks > kick
+        cuts = np.sort(rng.choice(np.arange(1, size), size=(count, 3)), axis=1)
+        a, b, c = cuts[:, 0:1], cuts[:, 1:2], cuts[:, 2:3]
+        mid = a + (c - b)
+        source = np.where(positions < a, positions,
+                 np.where(positions < mid, b + (positions - a),
+                 np.where(positions < c, a + (positions - mid), positions)))
+        tours[rows] = np.take_along_axis(tours[rows], source[rows], axis=1)
+    return tours
+
+
+def _copies(tour: np.ndarray, count: int, rng: np.random.Generator) -> np.ndarray:
+    # Deterministik kurulumlar bir kez yapılır; ilk kopya dışındakiler 1-3 double-bridge ile çeşitlendirilir
+    tours = np.tile(np.asarray(tour, dtype=np.int32), (count, 1))
+    kicks = rng.integers(1, 4, size=count)
+    kicks[0] = 0
+    return _double_bridge(tours, rng, kicks)
+
+
+def _distance_to(tsp_data, city: int, others: np.ndarray) -> np.ndarray:
+    return tsp_data.distances_between(np.full(len(others), city), others)
+
+
+class _NearestUnvisited:
+    # Aday listesi tükendiğinde en yakın ziyaret edilmemiş şehir: KD-ağacı yaprakları kutu mesafesine göre
+    # taranır, boşalmış yapraklar atlanır (her seferinde O(N) tarama yerine)
+
+    def __init__(self, tsp_data):
+        self.tsp_data = tsp_data
+        self.remaining = np.ones(tsp_data.dimension, dtype=bool)
+        # Silmeler biriktirilip bir sonraki aramada toplu uygulanır (adım başına numpy çağrısı yok)
+        self.pending: List[int] = []
+        self.euclidean = tsp_data.distance_matrix is None or tsp_data.edge_weight_type in ("EUC_2D", "ATT", "CEIL_2D")
+        if self.euclidean:
+            self.tree = tsp_data.kdtree()
+            sizes = self.tree.leaf_end - self.tree.leaf_start
+            self.leaf_of = np.empty(tsp_data.dimension, dtype=np.int64)
+            self.leaf_of[self.tree.order] = np.repeat(np.arange(len(sizes)), sizes)
+            self.left = sizes.copy()
+
+    def remove(self, city: int):
+        self.pending.append(city)
+
+    def nearest(self, city: int) -> int:
+        if self.pending:
+            pending = np.array(self.pending)
+            self.remaining[pending] = False
+            if self.euclidean:
+                np.subtract.at(self.left, self.leaf_of[pending], 1)
+            self.pending = []
+
+        if not self.euclidean:
+            others = np.flatnonzero(self.remaining)
+            return int(others[np.argmin(_distance_to(self.tsp_data, city, others))])
+
+        tree = self.tree
+        point = tree.points[city]
+        gap = np.maximum(0.0, np.maximum(tree.lo - point, point - tree.hi))
+        box_d2 = (gap * gap).sum(axis=1)
+        box_d2[self.left == 0] = np.inf
+        best, best_d2 = -1, np.inf
+        for leaf in np.argsort(box_d2):
+            if box_d2[leaf] >= best_d2:
+                break
+            cities = tree.order[tree.leaf_start[leaf]:tree.leaf_end[leaf]]
+            cities = cities[self.remaining[cities]]
+            d2 = ((tree.points[cities] - point) ** 2).sum(axis=1)
+            j = int(np.argmin(d2))
+            if d2[j] < best_d2:
+                best, best_d2 = int(cities[j]), d2[j]
+        return best
+
+
+def nearest_neighbor_tour(tsp_data, start: int, candidates: List[List[int]]) -> List[int]:
+    n = tsp_data.dimension
+    visited = bytearray(n)
+    unvisited = _NearestUnvisited(tsp_data)
+    tour = [start]
+    visited[start] = 1
+    unvisited.remove(start)
+    current = start
+
+    for _ in range(n - 1):
+        nxt = -1
+        # Aday listesi yakından uzağa sıralı: ziyaret edilmemiş ilk aday en yakınıdır
+        for city in candidates[current]:
+            if not visited[city]:
+                nxt = city
+                break
+        if nxt < 0:
+            nxt = unvisited.nearest(current)
+        visited[nxt] = 1
+        unvisited.remove(nxt)
+        tour.append(nxt)
+        current = nxt
+    return tour
+
+
+def nearest_neighbor_tours(tsp_data, count: int, rng: np.random.Generator) -> np.ndarray:
+    candidates = tsp_data.nearest_neighbors(CANDIDATE_COUNT).tolist()
+    starts = rng.choice(tsp_data.dimension, size=count, replace=count > tsp_data.dimension)
+    return np.array([nearest_neighbor_tour(tsp_data, int(s), candidates) for s in starts], dtype=np.int32)
+
+
+def _candidate_edges(tsp_data, k: int, extra: np.ndarray = None):
+    # Aday listelerinden tekil (u < v) kenarlar, uzunluğa göre sıralı
+    neighbors = tsp_data.nearest_neighbors(k)
+    u = np.repeat(np.arange(tsp_data.dimension), neighbors.shape[1])
+    v = neighbors.ravel().astype(np.int64)
+    if extra is not None:
+        u = np.concatenate([u, extra[:, 0]])
+        v = np.concatenate([v, extra[:, 1]])
+    n = tsp_data.dimension
+    keys = np.unique(np.minimum(u, v) * n + np.maximum(u, v))
+    edges = np.column_stack([keys // n, keys % n])
+    edges = edges[edges[:, 0] != edges[:, 1]]
+    lengths = tsp_data.distances_between(edges[:, 0], edges[:, 1])
+    order = np.argsort(lengths, kind="stable")
+    return edges[order], lengths[order]
+
+
+def _find(parent: List[int], x: int) -> int:
+    while parent[x] != x:
+        parent[x] = parent[parent[x]]
+        x = parent[x]
+    return x
+
+
+def _join_fragments(tsp_data, adjacency: List[List[int]]) -> List[int]:
+    # Parçalar (yollar) açgözlü birleştirilir: mevcut uçtan en yakın parça ucuna
+    n = tsp_data.dimension
+    seen = bytearray(n)
+    fragments = []
+    for city in range(n):
+        if seen[city] or len(adjacency[city]) == 2:
+            continue
+        path = [city]
+        seen[city] = 1
+        prev, current = -1, city
+        while True:
+            nxt = [c for c in adjacency[current] if c != prev and not seen[c]]
+            if not nxt:
+                break
+            prev, current = current, nxt[0]
+            seen[current] = 1
+            path.append(current)
+        fragments.append(path)
+    heads = np.array([f[0] for f in fragments])
+    tails = np.array([f[-1] for f in fragments])
+    used = np.zeros(len(fragments), dtype=bool)
+    used[0] = True
+    tour = list(fragments[0])
+    for _ in range(len(fragments) - 1):
+        open_idx = np.flatnonzero(~used)
+        end = tour[-1]
+        to_head = _distance_to(tsp_data, end, heads[open_idx])
+        to_tail = _distance_to(tsp_data, end, tails[open_idx])
+        best_head = int(np.argmin(to_head))
+        best_tail = int(np.argmin(to_tail))
+        if to_head[best_head] <= to_tail[best_tail]:
+            chosen = int(open_idx[best_head])
+            tour.extend(fragments[chosen])
+        else:
+            chosen = int(open_idx[best_tail])
+            tour.extend(reversed(fragments[chosen]))
+        used[chosen] = True
+    return tour
+
+
+def greedy_edge_tour(tsp_data) -> List[int]:
+    # Kısa kenardan uzuna: iki ucun derecesi < 2 ve döngü oluşmuyorsa kenar eklenir
+    n = tsp_data.dimension
+    edges, _ = _candidate_edges(tsp_data, CANDIDATE_COUNT)
+    parent = list(range(n))
+    adjacency: List[List[int]] = [[] for _ in range(n)]
+    added = 0
+    for u, v in edges.tolist():
+        if len(adjacency[u]) == 2 or len(adjacency[v]) == 2:
+            continue
+        ru, rv = _find(parent, u), _find(parent, v)
+        if ru == rv:
+            continue
+        parent[ru] = rv
+        adjacency[u].append(v)
+        adjacency[v].append(u)
+        added += 1
+        if added == n - 1:
+            break
+    return _join_fragments(tsp_data, adjacency)
+
+
+def greedy_edge_tours(tsp_data, count: int, rng: np.random.Generator) -> np.ndarray:
+    return _copies(greedy_edge_tour(tsp_data), count, rng)
+
+
+def hilbert_index(x: np.ndarray, y: np.ndarray, order: int = 16) -> np.ndarray:
+    # (x, y) ızgara hücresinin Hilbert eğrisi üzerindeki sırası; tüm noktalar için vektörel
+    side = 1 << order
+    x = x.astype(np.int64)
+    y = y.astype(np.int64)
+    d = np.zeros(len(x), dtype=np.int64)
+    s = side >> 1
+    while s > 0:
+        rx = ((x & s) > 0).astype(np.int64)
+        ry = ((y & s) > 0).astype(np.int64)
+        d += s * s * ((3 * rx) ^ ry)
+        flip = (ry == 0) & (rx == 1)
+        x = np.where(flip, side - 1 - x, x)
+        y = np.where(flip, side - 1 - y, y)
+        swap = ry == 0
+        x, y = np.where(swap, y, x), np.where(swap, x, y)
+        s >>= 1
+    return d
+
+
+def hilbert_order(coords: np.ndarray, angle: float = 0.0, order: int = 16) -> np.ndarray:
+    c, s = np.cos(angle), np.sin(angle)
+    points = coords @ np.array([[c, -s], [s, c]])
+    lo = points.min(axis=0)
+    span = max(float((points.max(axis=0) - lo).max()), 1e-12)
+    grid = np.minimum((points - lo) / span * (1 << order), (1 << order) - 1)
+    return np.argsort(hilbert_index(grid[:, 0], grid[:, 1], order), kind="stable")
+
+
+def hilbert_tours(tsp_data, count: int, rng: np.random.Generator) -> np.ndarray:
+    if np.ptp(tsp_data.coords) == 0:
+        # Koordinatsız (EXPLICIT) örnek: uzay doldurma sırası anlamsız
+        return random_tours(tsp_data, count, rng)
+    # Her kopya için rastgele döndürme: farklı ama yerel olarak iyi sıralamalar
+    tours = np.array([hilbert_order(tsp_data.coords, rng.uniform(0, 2 * np.pi)) for _ in range(count)],
+                     dtype=np.int32)
+    return np.roll(tours, -int(rng.integers(tsp_data.dimension)), axis=1)
+
+
+def _euler_circuit(adjacency: List[List[int]], start: int) -> List[int]:
+    # Hierholzer (yinelemeli); kenarlar çoklu olabilir
+    adjacency = [list(a) for a in adjacency]
+    stack = [start]
+    circuit = []
+    while stack:
+        v = stack[-1]
+        if adjacency[v]:
+            u = adjacency[v].pop()
+            adjacency[u].remove(v)
+            stack.append(u)
+        else:
+            circuit.append(stack.pop())
+    return circuit
+
+
+def christofides_tour(tsp_data) -> List[int]:
+    # Christofides-lite: aday kenarlardan MST (Kruskal), tek dereceli düğümlerde açgözlü eşleme
+    # (en az ağırlıklı mükemmel eşleme yerine), Euler turu ve kısayollar
+    n = tsp_data.dimension
+    curve = hilbert_order(tsp_data.coords)
+    # Hilbert komşuları bağlantılılığı garanti eder (aday grafiği kopuk olabilir)
+    chain = np.column_stack([curve[:-1], curve[1:]])
+    edges, _ = _candidate_edges(tsp_data, CANDIDATE_COUNT, chain)
+
+    parent = list(range(n))
+    adjacency: List[List[int]] = [[] for _ in range(n)]
+    added = 0
+    for u, v in edges.tolist():
+        ru, rv = _find(parent, u), _find(parent, v)
+        if ru == rv:
+            continue
+        parent[ru] = rv
+        adjacency[u].append(v)
+        adjacency[v].append(u)
+        added += 1
+        if added == n - 1:
+            break
+
+    odd = bytearray(len(a) % 2 for a in adjacency)
+    for u, v in edges.tolist():
+        if odd[u] and odd[v]:
+            odd[u] = odd[v] = 0
+            adjacency[u].append(v)
+            adjacency[v].append(u)
+    # Eşlenemeyen tek dereceli düğümler Hilbert sırasında ikişer eşlenir (sayıları her zaman çift)
+    leftover = [c for c in curve.tolist() if odd[c]]
+    for u, v in zip(leftover[0::2], leftover[1::2]):
+        adjacency[u].append(v)
+        adjacency[v].append(u)
+
+    seen = bytearray(n)
+    tour = []
+    for city in _euler_circuit(adjacency, 0):
+        if not seen[city]:
+            seen[city] = 1
+            tour.append(city)
+    return tour
+
+
+def christofides_tours(tsp_data, count: int, rng: np.random.Generator) -> np.ndarray:
+    return _copies(christofides_tour(tsp_data), count, rng)
+
+
+SEEDING_STRATEGIES: Dict[str, SeedingStrategy] = {
+    "random": random_tours,
+    "nn": nearest_neighbor_tours,
+    "greedy": greedy_edge_tours,
+    "hilbert": hilbert_tours,
+    "christofides": christofides_tours,
+}
+
+
+def seed_population(tsp_data, size: int, rng: np.random.Generator, fractions: Dict[str, float] = None) -> np.ndarray:
+    fractions = DEFAULT_SEEDING if fractions is None else fractions
+    for name in fractions:
+        if name not in SEEDING_STRATEGIES:
+            raise ValueError(f"Bilinmeyen başlatma yöntemi: {name} (seçenekler: {', '.join(SEEDING_STRATEGIES)})")
+    if sum(fractions.values()) > 1.0 + 1e-9 or min(fractions.values(), default=0) < 0:
+        raise ValueError("Başlatma oranları 0 ile 1 arasında olmalı ve toplamı 1'i geçmemeli")
+
+    genes = np.empty((size, tsp_data.dimension), dtype=np.int32)
+    # Çok küçük örneklerde sezgisel kurulumların anlamı yok
+    counts = {} if tsp_data.dimension < 8 else {name: int(fraction * size) for name, fraction in fractions.items()}
+    row = 0
+    for name, count in counts.items():
+        if count > 0 and name != "random":
+            genes[row:row + count] = SEEDING_STRATEGIES[name](tsp_data, count, rng)
+            row += count
+    genes[row:] = random_tours(tsp_data, size - row, rng)
+    return genes
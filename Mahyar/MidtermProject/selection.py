@@ -0,0 +1,107 @@
+# Kaan Kara - 220404046
+
+from abc import ABC, abstractmethod
+from typing import Dict, Type
+
+import numpy as np
+
+
+class AliasTable:
+    # Walker/Vose alias tablosu: O(P) kurulum, çekiliş başına O(1)
+
+    def __init__(self, weights: np.ndarray):
+        weights = np.asarray(weights, dtype=np.float64)
+        n = len(weights)
+        total = weights.sum()
+        if total <= 0:
+            weights = np.ones(n)
+            total = float(n)
+
+        scaled = weights * (n / total)
+        self.prob = np.ones(n, dtype=np.float64)
+        self.alias = np.arange(n, dtype=np.int64)
+
+        small = [i for i in range(n) if scaled[i] < 1.0]
+        large = [i for i in range(n) if scaled[i] >= 1.0]
+        while small and large:
+            s = small.pop()
+            l = large[-1]
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            if scaled[l] < 1.0:
+                small.append(large.pop())
+
+    def draw(self, rng: np.random.Generator, k: int) -> np.ndarray:
+        idx = rng.integers(0, len(self.prob), size=k)
+        return np.where(rng.random(k) < self.prob[idx], idx, self.alias[idx])
+
+
+class SelectionStrategy(ABC):
+    name = ""
+
+    @abstractmethod
+    def prepare(self, distances: np.ndarray):
+        # Nesil başına bir kez çağrılır
+        ...
+
+    @abstractmethod
+    def draw(self, rng: np.random.Generator, k: int) -> np.ndarray:
+        # k ebeveyn indeksi döndürür
+        ...
+
+
+class RankSelection(SelectionStrategy):
+    name = "rank"
+
+    def prepare(self, distances: np.ndarray):
+        n = len(distances)
+        # En kötü tur rank 1, en iyi tur rank n
+        ranks = np.empty(n, dtype=np.float64)
+        ranks[np.argsort(-distances, kind="stable")] = np.arange(1, n + 1)
+        self.table = AliasTable(ranks)
+
+    def draw(self, rng: np.random.Generator, k: int) -> np.ndarray:
+        return self.table.draw(rng, k)
+
+
+class RouletteSelection(SelectionStrategy):
+    name = "roulette"
+
+    def prepare(self, distances: np.ndarray):
+        fitness = np.where(distances > 0, 1.0 / np.maximum(distances, 1e-12), 0.0)
+        self.table = AliasTable(fitness)
+
+    def draw(self, rng: np.random.Generator, k: int) -> np.ndarray:
+        return self.table.draw(rng, k)
+
+
+class TournamentSelection(SelectionStrategy):
+    # genetic_operators.tournament_selection ile aynı fikir; adaylar iadeli çekilir
+    name = "tournament"
+
+    def __init__(self, tournament_size: int = 3):
+        self.tournament_size = tournament_size
+
+    def prepare(self, distances: np.ndarray):
+        self.distances = distances
+
+    def draw(self, rng: np.random.Generator, k: int) -> np.ndarray:
+        candidates = rng.integers(0, len(self.distances), size=(k, self.tournament_size))
+        winners = np.argmin(self.distances[candidates], axis=1)
+        return candidates[np.arange(k), winners]
+
+
+SELECTION_STRATEGIES: Dict[str, Type[SelectionStrategy]] = {
+    RankSelection.name: RankSelection,
+    RouletteSelection.name: RouletteSelection,
+    TournamentSelection.name: TournamentSelection,
+}
+
+
+def make_selection(strategy) -> SelectionStrategy:
+    if isinstance(strategy, SelectionStrategy):
+        return strategy
+    if strategy not in SELECTION_STRATEGIES:
+        raise ValueError(f"Bilinmeyen seçim yöntemi: {strategy} (seçenekler: {', '.join(SELECTION_STRATEGIES)})")
+    return SELECTION_STRATEGIES[strategy]()
@@ -0,0 +1,478 @@
+# Kaan Kara - 220404046
+
+import argparse
+import asyncio
+import glob
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator, Callable, Dict, Optional, Tuple
+
+from islands import SharedTSPData, attach_tsp_data
+from tsp_genetic_algorithm import TSPData, GeneticAlgorithm
+
+
+logger = logging.getLogger(__name__)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+# Yüklenen .tsp gövdesi için üst sınır (bayt)
+MAX_BODY = 64 * 1024 * 1024
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+           500: "Internal Server Error"}
+
+
+class InstanceCache:
+    # Ayrıştırılmış TSPData + uzaklık matrisinin paylaşımlı bellek kopyası, LRU. Kullanımdaki (iş kuyruğunda ya da
+    # çalışan) örnekler atılmaz; hepsi kullanımdaysa kapasite geçici olarak aşılır
+
+    def __init__(self, capacity: int = 8):
+        self.capacity = capacity
+        self.entries: "OrderedDict[str, Tuple[TSPData, SharedTSPData]]" = OrderedDict()
+        self.users: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def acquire(self, key: str, loader: Callable[[], TSPData]) -> Tuple[TSPData, SharedTSPData]:
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        else:
+            self.misses += 1
+            tsp_data = loader()
+            self.entries[key] = (tsp_data, SharedTSPData(tsp_data))
+        self.users[key] = self.users.get(key, 0) + 1
+        self._evict()
+        return self.entries[key]
+
+    def release(self, key: str):
+        self.users[key] -= 1
+        if self.users[key] == 0:
+            del self.users[key]
+        self._evict()
+
+    def _evict(self):
+        for key in list(self.entries):
+            if len(self.entries) <= self.capacity:
+                break
+            if key not in self.users:
+                self.entries.pop(key)[1].close()
+
+    def close(self):
+        for _, shared in self.entries.values():
+            shared.close()
+        self.entries.clear()
+
+
+# İşçi süreç durumu: ilerleme kuyruğu ve bağlanılmış örnekler (paylaşımlı bellek adıyla anahtarlı)
+_progress_queue = None
+_worker_instances: "OrderedDict[str, tuple]" = OrderedDict()
+WORKER_CACHE_SIZE = 4
+
+
+def _init_worker(progress_queue):
+    global _progress_queue
+    _progress_queue = progress_queue
+
+
+def _attached(spec: dict) -> TSPData:
+    key = next(iter(spec['arrays'].values()))[0]
+    if key not in _worker_instances:
+        _worker_instances[key] = attach_tsp_data(spec)
+        while len(_worker_instances) > WORKER_CACHE_SIZE:
+            for block in _worker_instances.popitem(last=False)[1][1]:
+                block.close()
+    _worker_instances.move_to_end(key)
+    return _worker_instances[key][0]
+
+
+def _solve_job(job_id: int, spec: dict, params: dict) -> dict:
+    # İşçide çalışır: ilerleme (nesil, en iyi uzunluk) en fazla progress_interval saniyede bir kuyruğa yazılır,
+    # iş bitince (hata olsa da) None ile kapatılır
+    start = time.perf_counter()
+    last = [0.0]
+
+    def on_generation(stats: dict):
+        now = time.perf_counter()
+        if now - last[0] >= params['progress_interval']:
+            last[0] = now
+            _progress_queue.put((job_id, {'event': 'progress', 'generation': stats['generation'],
+                                          'best': stats['best'], 'seconds': now - start}))
+
+    try:
+        tsp_data = _attached(spec)
+        ga = GeneticAlgorithm(tsp_data, population_size=params['population_size'], seed=params['seed'],
+                              on_generation=on_generation)
+        ga.run(max_generations=params['max_generations'], stagnation_limit=sys.maxsize, verbose=False,
+               use_local_search=params['local_search'], time_budget=params['time_budget'])
+        return {
+            'event': 'result',
+            'name': tsp_data.name,
+            'cities': tsp_data.dimension,
+            'generations': ga.generation,
+            'initial': ga.best_history[0],
+            'best': ga.best_chromosome.get_total_distance(),
+            'tour': tsp_data.to_city_ids(ga.best_chromosome.genes),
+            'seconds': time.perf_counter() - start,
+        }
+    finally:
+        _progress_queue.put((job_id, None))
+
+
+def bundled_instances(directory: str = HERE) -> Dict[str, str]:
+    return {os.path.splitext(os.path.basename(path))[0]: path
+            for path in sorted(glob.glob(os.path.join(directory, "*.tsp")))}
+
+
+def _load_uploaded(text: str) -> TSPData:
+    # Ayrıştırıcı mmap ile dosya okur: gövde geçici dosyaya yazılır (.npz önbelleği yazılmaz)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "upload.tsp")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return TSPData(path, use_cache=False)
+
+
+class HTTPError(Exception):
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class SolveService:
+    # Yerel asyncio HTTP servisi (yalnızca standart kütüphane):
+    #   GET  /instances  paketteki örnekler ve önbellekteki örnekler
+    #   GET  /status     işçi/iş sayaçları, önbellek isabetleri
+    #   POST /solve      {"instance": "berlin52"} ya da {"tsp": "<TSPLIB metni>"} + GA parametreleri;
+    #                    yanıt parçalı (chunked) NDJSON: progress olayları, sonunda result ya da error
+
+    def __init__(self, instance_dir: str = HERE, workers: int = None, cache_size: int = 8,
+                 max_time_budget: float = 300.0, progress_interval: float = 0.25):
+        self.instances = bundled_instances(instance_dir)
+        self.workers = workers or os.cpu_count() or 1
+        self.cache = InstanceCache(cache_size)
+        self.max_time_budget = max_time_budget
+        self.progress_interval = progress_interval
+        self.jobs: Dict[int, asyncio.Queue] = {}
+        self.next_job = 0
+        self.completed = 0
+        self.failed = 0
+        self.server: asyncio.AbstractServer = None
+        self.pool: ProcessPoolExecutor = None
+        self._context = multiprocessing.get_context("spawn")
+        self._progress = None
+        self._reader: threading.Thread = None
+        self._load_lock: asyncio.Lock = None
+        self._loop: asyncio.AbstractEventLoop = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> int:
+        # port=0 ile boş bir port seçilir; dinlenen port döner
+        self._loop = asyncio.get_running_loop()
+        self._load_lock = asyncio.Lock()
+        self._progress = self._context.Queue()
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=self._context,
+                                        initializer=_init_worker, initargs=(self._progress,))
+        self._reader = threading.Thread(target=self._read_progress, daemon=True)
+        self._reader.start()
+        self.server = await asyncio.start_server(self._handle, host, port)
+        port = self.server.sockets[0].getsockname()[1]
+        logger.info("Çözüm servisi http://%s:%d (%d işçi, %d örnek)", host, port, self.workers, len(self.instances))
+        return port
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.pool is not None:
+            await self._loop.run_in_executor(None, self.pool.shutdown)
+        if self._progress is not None:
+            self._progress.put(None)
+            self._reader.join()
+        self.cache.close()
+
+    def _read_progress(self):
+        # İşçilerin ortak kuyruğu ayrı iş parçacığında okunur ve iş başına asyncio kuyruğuna aktarılır
+        while True:
+            item = self._progress.get()
+            if item is None:
+                return
+            self._loop.call_soon_threadsafe(self._dispatch, *item)
+
+    def _dispatch(self, job_id: int, event: Optional[dict]):
+        queue = self.jobs.get(job_id)
+        if queue is not None:
+            queue.put_nowait(event)
+
+    async def _instance(self, request: dict) -> Tuple[str, TSPData, SharedTSPData, bool]:
+        if "tsp" in request:
+            text = request["tsp"]
+            key = "sha1:" + hashlib.sha1(text.encode("utf-8")).hexdigest()
+            loader = lambda: _load_uploaded(text)
+        elif "instance" in request:
+            name = request["instance"]
+            if name not in self.instances:
+                raise HTTPError(404, f"Bilinmeyen örnek: {name} (seçenekler: {', '.join(self.instances)})")
+            key = name
+            path = self.instances[name]
+            loader = lambda: TSPData(path)
+        else:
+            raise HTTPError(400, "İstekte 'instance' ya da 'tsp' alanı olmalı")
+
+        # Ayrıştırma ve matris kurulumu olay döngüsünü bloklamasın diye iş parçacığında
+        async with self._load_lock:
+            cached = key in self.cache.entries
+            try:
+                if cached:
+                    tsp_data, shared = self.cache.acquire(key, loader)
+                else:
+                    tsp_data, shared = await self._loop.run_in_executor(None, self.cache.acquire, key, loader)
+            except (ValueError, OSError, IndexError) as exc:
+                raise HTTPError(400, f"Örnek okunamadı: {exc}")
+        return key, tsp_data, shared, cached
+
+    def _params(self, request: dict) -> dict:
+        try:
+            time_budget = float(request.get("time_budget", 10.0))
+            params = {
+                'time_budget': min(time_budget, self.max_time_budget),
+                'max_generations': int(request.get("max_generations", sys.maxsize)),
+                'population_size': int(request.get("population_size", 100)),
+                'seed': None if request.get("seed") is None else int(request["seed"]),
+                'local_search': bool(request.get("local_search", False)),
+                'progress_interval': float(request.get("progress_interval", self.progress_interval)),
+            }
+        except (TypeError, ValueError) as exc:
+            raise HTTPError(400, f"Geçersiz parametre: {exc}")
+        if params['time_budget'] <= 0 or params['population_size'] < 2:
+            raise HTTPError(400, "time_budget pozitif, population_size en az 2 olmalı")
+        return params
+
+    async def solve(self, request: dict) -> AsyncIterator[dict]:
+        # HTTP'den bağımsız iş akışı: progress olayları, sonunda result (ya da error)
+        params = self._params(request)
+        key, tsp_data, shared, cached = await self._instance(request)
+        job_id = self.next_job
+        self.next_job += 1
+        queue: asyncio.Queue = asyncio.Queue()
+        self.jobs[job_id] = queue
+        future = None
+        try:
+            future = self._loop.run_in_executor(self.pool, _solve_job, job_id, shared.spec, params)
+            # Örnek iş bitene kadar tutulur: istemci kopsa da kuyruktaki/çalışan iş paylaşımlı belleği kullanıyor
+            future.add_done_callback(lambda f: self.cache.release(key))
+            # İşçi süreç ölürse kapanış (None) gelmez: kuyruk gelecekten de kapatılır
+            future.add_done_callback(lambda f: f.cancelled() or f.exception() is None or queue.put_nowait(None))
+            yield {'event': 'accepted', 'job': job_id, 'name': tsp_data.name, 'cities': tsp_data.dimension,
+                   'cached': cached,
+                   'time_budget': params['time_budget']}
+            while True:
+                event = await queue.get()
+                if event is None:
+                    break
+                yield event
+            try:
+                result = await future
+            except Exception as exc:
+                self.failed += 1
+                yield {'event': 'error', 'error': f"{type(exc).__name__}: {exc}"}
+                return
+            self.completed += 1
+            yield result
+        finally:
+            del self.jobs[job_id]
+            if future is None:
+                self.cache.release(key)
+
+    def status(self) -> dict:
+        return {
+            'workers': self.workers,
+            'running': len(self.jobs),
+            'completed': self.completed,
+            'failed': self.failed,
+            'cache': {'size': len(self.cache.entries), 'capacity': self.cache.capacity,
+                      'hits': self.cache.hits, 'misses': self.cache.misses},
+        }
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            method, path, body = await self._read_request(reader)
+            if path == "/solve":
+                if method != "POST":
+                    raise HTTPError(405, "Yalnızca POST")
+                try:
+                    request = json.loads(body or b"{}")
+                except json.JSONDecodeError as exc:
+                    raise HTTPError(400, f"Geçersiz JSON: {exc}")
+                if not isinstance(request, dict):
+                    raise HTTPError(400, "İstek gövdesi bir JSON nesnesi olmalı")
+                events = self.solve(request)
+                # İlk olay (örnek yükleme, parametre denetimi) hatasızsa akış başlar
+                first = await events.__anext__()
+                await self._stream(writer, first, events)
+            elif path in ("/instances", "/status"):
+                if method != "GET":
+                    raise HTTPError(405, "Yalnızca GET")
+                if path == "/status":
+                    payload = self.status()
+                else:
+                    payload = {'bundled': list(self.instances), 'cached': list(self.cache.entries)}
+                self._respond(writer, 200, payload)
+            else:
+                raise HTTPError(404, f"Bilinmeyen yol: {path}")
+        except HTTPError as exc:
+            self._respond(writer, exc.status, {'error': str(exc)})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            # İstemci koptu; çalışan iş bütçesi dolunca kendiliğinden biter
+            pass
+        except Exception as exc:
+            logger.exception("İstek işlenemedi")
+            self._respond(writer, 500, {'error': f"{type(exc).__name__}: {exc}"})
+        finally:
+            try:
+                await writer.drain()
+                writer.close()
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader) -> Tuple[str, str, bytes]:
+        line = await reader.readline()
+        parts = line.decode("latin-1").split()
+        if len(parts) != 3:
+            raise HTTPError(400, "Geçersiz istek satırı")
+        method, path = parts[0].upper(), parts[1].split("?")[0]
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length", 0) or 0)
+        if length > MAX_BODY:
+            raise HTTPError(413, f"Gövde çok büyük (en fazla {MAX_BODY} bayt)")
+        body = await reader.readexactly(length) if length else b""
+        return method, path, body
+
+    @staticmethod
+    def _respond(writer: asyncio.StreamWriter, status: int, payload: dict):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1") + body)
+
+    @staticmethod
+    async def _stream(writer: asyncio.StreamWriter, first: dict, events: AsyncIterator[dict]):
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+                     b"Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n")
+
+        async def send(event: dict):
+            line = json.dumps(event, ensure_ascii=False).encode("utf-8") + b"\n"
+            writer.write(f"{len(line):x}\r\n".encode("latin-1") + line + b"\r\n")
+            await writer.drain()
+
+        try:
+            await send(first)
+            async for event in events:
+                await send(event)
+        finally:
+            await events.aclose()
+        writer.write(b"0\r\n\r\n")
+
+
+async def request_solve(host: str, port: int, request: dict) -> AsyncIterator[dict]:
+    # İstemci: /solve akışını satır satır olay sözlüğü olarak döndürür (HTTP hatasında ValueError)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        body = json.dumps(request).encode("utf-8")
+        writer.write(f"POST /solve HTTP/1.1\r\nHost: {host}:{port}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1") + body)
+        await writer.drain()
+        status = int((await reader.readline()).split()[1])
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if status != 200:
+            payload = json.loads(await reader.read())
+            raise ValueError(f"HTTP {status}: {payload.get('error')}")
+        buffer = b""
+        while True:
+            size = int((await reader.readline()).strip() or b"0", 16)
+            if size == 0:
+                break
+            buffer += await reader.readexactly(size)
+            await reader.readexactly(2)
+            while b"\n" in buffer:
+                line, buffer = buffer.split(b"\n", 1)
+                yield json.loads(line)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def _serve(args):
+    service = SolveService(args.instances, workers=args.workers, cache_size=args.cache_size,
+                           max_time_budget=args.max_time_budget)
+    await service.start(args.host, args.port)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await service.close()
+
+
+async def _client(args):
+    if os.path.exists(args.instance):
+        with open(args.instance, encoding="utf-8") as f:
+            request = {'tsp': f.read()}
+    else:
+        request = {'instance': args.instance}
+    request.update(time_budget=args.time_budget, seed=args.seed)
+    async for event in request_solve(args.host, args.port, request):
+        if event['event'] == 'accepted':
+            print(f"İş {event['job']}: {event['name']} ({event['cities']} şehir, "
+                  f"önbellekte: {'evet' if event['cached'] else 'hayır'})")
+        elif event['event'] == 'progress':
+            print(f"Nesil {event['generation']}: En İyi Mesafe = {event['best']:.2f} ({event['seconds']:.1f} sn)")
+        elif event['event'] == 'result':
+            print(f"Sonuç: {event['name']}, {event['generations']} nesil, En İyi Mesafe: {event['best']:.2f}")
+        else:
+            print(json.dumps(event, ensure_ascii=False))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Yerel asyncio HTTP TSP çözüm servisi ve istemcisi")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="Servisi başlat")
+    serve.add_argument("--instances", default=HERE, help="Ada göre çözülebilecek .tsp dosyalarının dizini")
+    serve.add_argument("--workers", type=int, default=None)
+    serve.add_argument("--cache-size", type=int, default=8, help="Bellekte tutulan örnek sayısı (LRU)")
+    serve.add_argument("--max-time-budget", type=float, default=300.0, help="İş başına en fazla saniye")
+    solve = commands.add_parser("solve", help="Çalışan servise iş gönder, ilerlemeyi yazdır")
+    solve.add_argument("instance", help="Paketteki örnek adı (ör. berlin52) ya da yüklenecek .tsp dosyası")
+    solve.add_argument("--time-budget", type=float, default=10.0)
+    solve.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    try:
+        asyncio.run(_serve(args) if args.command == "serve" else _client(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
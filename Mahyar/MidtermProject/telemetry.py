@@ -0,0 +1,56 @@
+# Kaan Kara - 220404046
+
+import csv
+import json
+from typing import Dict
+
+
+# create_next_generation içindeki ölçülen aşamalar; cache (önbellek/kopya reddi), scheduler (operatör kredisi) ve
+# diversity (entropi ölçümü + yeniden başlatma) yalnızca ilgili özellik açıkken sıfırdan farklıdır
+PHASES = ("selection", "crossover", "fitness", "mutation", "elitism", "cache", "scheduler", "diversity")
+
+
+class PhaseTimer:
+    # Aşama başına toplam süre (saniye) ve son neslin süreleri; sayaçlar her nesil birkaç toplama işlemi
+    def __init__(self):
+        self.total: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.last: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+
+    def record(self, **seconds: float):
+        for phase, value in seconds.items():
+            self.last[phase] = value
+            self.total[phase] += value
+
+    def reset(self):
+        for phase in PHASES:
+            self.total[phase] = 0.0
+            self.last[phase] = 0.0
+
+
+class TelemetryWriter:
+    # on_generation geri çağrısı olarak kullanılır: her nesil bir JSONL ya da CSV satırı
+    def __init__(self, path: str, fmt: str = None):
+        self.fmt = fmt or ("csv" if path.endswith(".csv") else "jsonl")
+        if self.fmt not in ("csv", "jsonl"):
+            raise ValueError(f"Bilinmeyen telemetri biçimi: {self.fmt} (seçenekler: csv, jsonl)")
+        self.file = open(path, "w", encoding="utf-8", newline="")
+        self.writer: csv.DictWriter = None
+
+    def __call__(self, stats: dict):
+        if self.fmt == "jsonl":
+            self.file.write(json.dumps(stats, ensure_ascii=False) + "\n")
+            return
+        if self.writer is None:
+            self.writer = csv.DictWriter(self.file, fieldnames=list(stats), extrasaction="ignore")
+            self.writer.writeheader()
+        self.writer.writerow(stats)
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self) -> "TelemetryWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
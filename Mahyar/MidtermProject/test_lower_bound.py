@@ -0,0 +1,65 @@
+# Kaan Kara - 220404046
+
+import numpy as np
+import pytest
+
+from lower_bound import exact_tour, held_karp_bound
+from tsp_genetic_algorithm import GeneticAlgorithm, TSPData
+
+
+# ulysses16 (TSPLIB, GEO), bilinen optimum 6859
+ULYSSES16 = """NAME: ulysses16
+TYPE: TSP
+DIMENSION: 16
+EDGE_WEIGHT_TYPE: GEO
+NODE_COORD_SECTION
+1 38.24 20.42
+2 39.57 26.15
+3 40.56 25.32
+4 36.26 23.12
+5 33.48 10.54
+6 37.56 12.19
+7 38.42 13.11
+8 37.52 20.44
+9 41.23 9.10
+10 41.17 13.05
+11 36.08 -5.21
+12 38.47 15.13
+13 38.15 15.35
+14 37.51 15.17
+15 35.49 14.32
+16 39.36 19.56
+EOF
+"""
+
+
+def random_instance(n: int, seed: int) -> TSPData:
+    coords = np.random.default_rng(seed).uniform(0, 1000, size=(n, 2))
+    return TSPData.from_arrays(f"rand{n}_{seed}", "EUC_2D", np.arange(1, n + 1), coords)
+
+
+def ga_length(tsp_data: TSPData) -> float:
+    ga = GeneticAlgorithm(tsp_data, population_size=20, seed=0)
+    return ga.run(max_generations=10, verbose=False, use_local_search=True).get_total_distance()
+
+
+def check_sandwich(tsp_data: TSPData) -> float:
+    # Alt sınır <= kesin optimum <= GA + 2-opt/3-opt sonucu
+    tour, optimum = exact_tour(tsp_data)
+    assert sorted(tour) == list(range(tsp_data.dimension))
+    assert tsp_data.tour_length(tour) == pytest.approx(optimum)
+    assert held_karp_bound(tsp_data)['bound'] <= optimum + 1e-9
+    assert optimum <= ga_length(tsp_data) + 1e-9
+    return optimum
+
+
+@pytest.mark.parametrize("n", [5, 8, 10, 12])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_bound_exact_ga_random(n, seed):
+    check_sandwich(random_instance(n, seed))
+
+
+def test_bound_exact_ga_ulysses16(tmp_path):
+    path = tmp_path / "ulysses16.tsp"
+    path.write_text(ULYSSES16)
+    assert check_sandwich(TSPData(str(path), use_cache=False)) == 6859
@@ -1,318 +1,1034 @@
 # Kaan Kara - 220404046
 
-import random
+import json
+import logging
 import math
 import os
-from typing import List, Tuple, Dict
-import copy
+import time
+from array import array
+from collections import OrderedDict, deque
+from typing import Callable, List, Tuple, Dict
+
+import numpy as np
+
+from crossover import cycle_crossover, get_crossover
+from diversity import normalized_edge_entropy, sampled_edge_distance
+from fitness_cache import FitnessCache, tour_keys
+from kdtree import KDTree
+from local_search import LocalSearch
+from operator_scheduler import OperatorScheduler
+from seeding import random_tours, seed_population
+from selection import SelectionStrategy, make_selection
+from telemetry import PhaseTimer
+from tsplib import load_tsplib
+
+# Yapılandırılmadığında (ör. batch_solver işçileri) INFO mesajları biçimlendirilmeden atlanır
+logger = logging.getLogger(__name__)
+
+GEO_PI = 3.141592
+GEO_RADIUS = 6378.388
+
+# run() varsayılan sonlandırması: son rate_window saniyede en iyi uzunluk saniyede %0,001'den az kısaldıysa durur
+DEFAULT_MIN_IMPROVEMENT_RATE = 1e-5
+
 
 class TSPData:
     
-    def __init__(self, filename: str):
+    def __init__(self, filename: str = None, matrix_limit: int = 5000, row_cache_size: int = 1024,
+                 use_cache: bool = True):
         self.filename = filename
-        self.cities: Dict[int, Tuple[float, float]] = {}
         self.dimension = 0
         self.edge_weight_type = "EUC_2D"
         self.name = ""
-        self.load_tsp_file()
+        # Şehirler 0..N-1 indekslerine eşlenir; city_ids[i] orijinal şehir numarasıdır
+        self.city_ids: np.ndarray = None
+        self.coords: np.ndarray = None
+        self.index_of: Dict[int, int] = {}
+        # matrix_limit üzerindeki şehir sayılarında tam matris yerine satır önbelleği kullanılır
+        self.matrix_limit = matrix_limit
+        self.row_cache_size = row_cache_size
+        self.distance_matrix: np.ndarray = None
+        self._row_cache: "OrderedDict[int, np.ndarray]" = OrderedDict()
+        self._distance_fn = None
+        self._neighbor_cache: Dict[int, np.ndarray] = {}
+        self._kdtree: KDTree = None
+        if filename is not None:
+            explicit_matrix = self.load_tsp_file(use_cache)
+            self.build_distance_matrix(explicit_matrix)
+    
+    @classmethod
+    def from_arrays(cls, name: str, edge_weight_type: str, city_ids: np.ndarray, coords: np.ndarray,
+                    distance_matrix: np.ndarray = None, matrix_limit: int = 5000) -> "TSPData":
+        # Dosya okumadan (ör. paylaşımlı bellekteki dizilerden) TSPData oluşturur
+        tsp_data = cls(None, matrix_limit=matrix_limit)
+        tsp_data.name = name
+        tsp_data.edge_weight_type = edge_weight_type
+        tsp_data.city_ids = np.asarray(city_ids, dtype=np.int64)
+        tsp_data.coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        tsp_data.build_distance_matrix(distance_matrix)
+        return tsp_data
+    
+    @property
+    def cities(self) -> Dict[int, Tuple[float, float]]:
+        # Eski arayüz: {şehir numarası: (x, y)}; büyük örneklerde dizileri doğrudan kullanın
+        return {int(c): (float(x), float(y)) for c, (x, y) in zip(self.city_ids, self.coords)}
     
-    def load_tsp_file(self):
-        with open(self.filename, 'r') as f:
-            lines = f.readlines()
+    def load_tsp_file(self, use_cache: bool = True) -> np.ndarray:
+        # Akışlı mmap ayrıştırıcı + .npz önbelleği (tsplib.py); EXPLICIT örneklerde dosyadaki matris döner
+        data = load_tsplib(self.filename, use_cache=use_cache)
+        self.name = data['name']
+        self.edge_weight_type = data['edge_weight_type']
+        self.city_ids = data['city_ids']
+        self.coords = data['coords']
+        self.dimension = len(self.city_ids)
+        return data.get('distance_matrix')
+    
+    def build_distance_matrix(self, distance_matrix: np.ndarray = None):
+        self.index_of = {int(city_id): i for i, city_id in enumerate(self.city_ids)}
+        self.dimension = len(self.city_ids)
+        self._row_cache.clear()
+        self._neighbor_cache.clear()
+        self._kdtree = None
+        
+        if distance_matrix is not None:
+            self.distance_matrix = distance_matrix
+            self._distance_fn = self.distance_matrix.item
+        elif self.dimension <= self.matrix_limit:
+            x = self.coords[:, 0]
+            y = self.coords[:, 1]
+            self.distance_matrix = self._pair_distances(x[:, None], y[:, None], x[None, :], y[None, :])
+            self._distance_fn = self.distance_matrix.item
+        else:
+            self.distance_matrix = None
+            self._distance_fn = self._make_scalar_distance()
+    
+    def _make_scalar_distance(self):
+        # Matris yokken tek çift için saf Python hesaplama (numpy skaler işlemlerinden çok daha hızlı)
+        xs = self.coords[:, 0].tolist()
+        ys = self.coords[:, 1].tolist()
         
-        reading_coords = False
-        for line in lines:
-            line = line.strip()
+        if self.edge_weight_type == "ATT":
+            def att_distance(i: int, j: int) -> int:
+                xd = xs[i] - xs[j]
+                yd = ys[i] - ys[j]
+                rij = math.sqrt((xd * xd + yd * yd) / 10.0)
+                tij = math.floor(rij + 0.5)
+                return tij + 1 if tij < rij else tij
+            return att_distance
+        
+        if self.edge_weight_type == "CEIL_2D":
+            def ceil_distance(i: int, j: int) -> int:
+                xd = xs[i] - xs[j]
+                yd = ys[i] - ys[j]
+                return math.ceil(math.sqrt(xd * xd + yd * yd))
+            return ceil_distance
+        
+        if self.edge_weight_type == "GEO":
+            lat = self._geo_radians(self.coords[:, 0]).tolist()
+            lon = self._geo_radians(self.coords[:, 1]).tolist()
             
-            if line.startswith('NAME'):
-                self.name = line.split(':')[1].strip()
-            elif line.startswith('DIMENSION'):
-                self.dimension = int(line.split(':')[1].strip())
-            elif line.startswith('EDGE_WEIGHT_TYPE'):
-                self.edge_weight_type = line.split(':')[1].strip()
-            elif line == 'NODE_COORD_SECTION':
-                reading_coords = True
-            elif line == 'EOF':
-                break
-            elif reading_coords and line:
-                parts = line.split()
-                if len(parts) >= 3:
-                    city_id = int(parts[0])
-                    x = float(parts[1])
-                    y = float(parts[2])
-                    self.cities[city_id] = (x, y)
-        
-        print(f"TSP Dosyası Yüklendi: {self.name}")
-        print(f"Şehir Sayısı: {self.dimension}")
+            def geo_distance(i: int, j: int) -> int:
+                q1 = math.cos(lon[i] - lon[j])
+                q2 = math.cos(lat[i] - lat[j])
+                q3 = math.cos(lat[i] + lat[j])
+                arg = min(1.0, max(-1.0, 0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3)))
+                return int(GEO_RADIUS * math.acos(arg) + 1.0)
+            return geo_distance
+        
+        def euc_distance(i: int, j: int) -> int:
+            xd = xs[i] - xs[j]
+            yd = ys[i] - ys[j]
+            return math.floor(math.sqrt(xd * xd + yd * yd) + 0.5)
+        return euc_distance
     
-    def calculate_distance(self, city1: int, city2: int) -> float:
-        x1, y1 = self.cities[city1]
-        x2, y2 = self.cities[city2]
+    @staticmethod
+    def _geo_radians(values: np.ndarray) -> np.ndarray:
+        # TSPLIB GEO: DDD.MM biçimi (derece + dakika), PI = 3.141592 sabitiyle
+        degrees = np.trunc(values)
+        return GEO_PI * (degrees + 5.0 * (values - degrees) / 3.0) / 180.0
+    
+    def _pair_distances(self, x1, y1, x2, y2) -> np.ndarray:
+        if self.edge_weight_type == "GEO":
+            lat1, lon1 = self._geo_radians(x1), self._geo_radians(y1)
+            lat2, lon2 = self._geo_radians(x2), self._geo_radians(y2)
+            q1 = np.cos(lon1 - lon2)
+            q2 = np.cos(lat1 - lat2)
+            q3 = np.cos(lat1 + lat2)
+            arg = np.clip(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), -1.0, 1.0)
+            return (GEO_RADIUS * np.arccos(arg) + 1.0).astype(np.int32)
         
+        xd = x1 - x2
+        yd = y1 - y2
+        if self.edge_weight_type == "CEIL_2D":
+            return np.ceil(np.sqrt(xd * xd + yd * yd)).astype(np.int32)
         if self.edge_weight_type == "ATT":
-            xd = x1 - x2
-            yd = y1 - y2
-            rij = math.sqrt((xd**2 + yd**2) / 10.0)
-            tij = int(round(rij))
-            return tij + 1 if tij < rij else tij
+            rij = np.sqrt((xd * xd + yd * yd) / 10.0)
+            tij = np.floor(rij + 0.5)
+            dij = np.where(tij < rij, tij + 1, tij)
         else:
-            return math.sqrt((x2 - x1)**2 + (y2 - y1)**2)
+            # TSPLIB EUC_2D: en yakın tam sayıya yuvarlanır (nint)
+            dij = np.floor(np.sqrt(xd * xd + yd * yd) + 0.5)
+        return dij.astype(np.int32)
+    
+    def distance_row(self, i: int) -> np.ndarray:
+        if self.distance_matrix is not None:
+            return self.distance_matrix[i]
+        
+        row = self._row_cache.get(i)
+        if row is not None:
+            self._row_cache.move_to_end(i)
+            return row
+        
+        x = self.coords[:, 0]
+        y = self.coords[:, 1]
+        row = self._pair_distances(x[i], y[i], x, y)
+        self._row_cache[i] = row
+        if len(self._row_cache) > self.row_cache_size:
+            self._row_cache.popitem(last=False)
+        return row
+    
+    def distance(self, i: int, j: int) -> int:
+        if self.distance_matrix is None:
+            row = self._row_cache.get(i)
+            if row is not None:
+                return int(row[j])
+        return self._distance_fn(i, j)
+    
+    def distance_function(self):
+        return self._distance_fn
+    
+    def kdtree(self) -> KDTree:
+        if self._kdtree is None:
+            self._kdtree = KDTree(self.coords)
+        return self._kdtree
+    
+    def nearest_neighbors(self, k: int) -> np.ndarray:
+        k = min(k, self.dimension - 1)
+        if k in self._neighbor_cache:
+            return self._neighbor_cache[k]
+        
+        n = self.dimension
+        if k <= 0:
+            return np.empty((n, 0), dtype=np.int32)
+        if self.distance_matrix is None or self.edge_weight_type in ("EUC_2D", "ATT", "CEIL_2D"):
+            # Bu mesafe türleri Öklid mesafesine göre monoton: KD-ağacı, O(N log N)
+            neighbors = self.kdtree().query_all(k)
+        else:
+            neighbors = np.empty((n, k), dtype=np.int32)
+            block = max(1, (1 << 22) // n)
+            for start in range(0, n, block):
+                rows = np.arange(start, min(n, start + block))
+                d = self.distance_matrix[rows].astype(np.float64)
+                d[np.arange(len(rows)), rows] = np.inf
+                
+                nearest = np.argpartition(d, k - 1, axis=1)[:, :k]
+                order = np.argsort(np.take_along_axis(d, nearest, axis=1), axis=1, kind="stable")
+                neighbors[rows] = np.take_along_axis(nearest, order, axis=1)
+        
+        self._neighbor_cache[k] = neighbors
+        return neighbors
+    
+    def calculate_distance(self, city1: int, city2: int) -> float:
+        return float(self.distance(self.index_of[city1], self.index_of[city2]))
+    
+    def tour_length(self, tour) -> float:
+        tour = np.asarray(tour)
+        nxt = np.roll(tour, -1)
+        if self.distance_matrix is not None:
+            return float(self.distance_matrix[tour, nxt].sum())
+        
+        a = self.coords[tour]
+        b = self.coords[nxt]
+        return float(self._pair_distances(a[:, 0], a[:, 1], b[:, 0], b[:, 1]).sum())
+    
+    def tour_lengths(self, tours: np.ndarray) -> np.ndarray:
+        nxt = np.roll(tours, -1, axis=1)
+        if self.distance_matrix is not None:
+            return self.distance_matrix[tours, nxt].sum(axis=1, dtype=np.int64).astype(np.float64)
+        
+        a = self.coords[tours]
+        b = self.coords[nxt]
+        edges = self._pair_distances(a[..., 0], a[..., 1], b[..., 0], b[..., 1])
+        return edges.sum(axis=1, dtype=np.int64).astype(np.float64)
+    
+    def distances_between(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        if self.distance_matrix is not None:
+            return self.distance_matrix[a, b].astype(np.int64)
+        ca = self.coords[a]
+        cb = self.coords[b]
+        return self._pair_distances(ca[..., 0], ca[..., 1], cb[..., 0], cb[..., 1]).astype(np.int64)
+    
+    def to_city_ids(self, tour) -> List[int]:
+        return self.city_ids[np.asarray(tour)].tolist()
+
+
+def compact_genes(genes) -> array:
+    # Kutulanmış int listesi yerine şehir başına 2 (N < 65536) ya da 4 bayt
+    genes = np.asarray(genes)
+    typecode = 'H' if len(genes) < 65536 else 'I'
+    return array(typecode, genes.astype(np.uint16 if typecode == 'H' else np.uint32).tobytes())
 
 
 class Chromosome:
+    # __dict__ yok: genler kompakt dizi (ya da popülasyon matrisinden satır görünümü), uzunluk tembel hesaplanır
+    __slots__ = ('_genes', 'tsp_data', '_distance')
     
-    def __init__(self, genes: List[int], tsp_data: TSPData):
-        self.genes = genes
+    def __init__(self, genes, tsp_data: TSPData, fitness: float = None, distance: float = None):
         self.tsp_data = tsp_data
-        self.fitness = self.calculate_fitness()
+        # ndarray satırı kopyalanmadan tutulur; liste vb. kompakt diziye çevrilir
+        self._genes = genes if isinstance(genes, (np.ndarray, array)) else compact_genes(genes)
+        if distance is None and fitness is not None:
+            distance = 1.0 / fitness if fitness > 0 else 0.0
+        self._distance = distance
+    
+    @property
+    def genes(self) -> List[int]:
+        # Eski arayüz: liste (kopya). .copy(), + ve == gibi liste kullanımları çalışır; depolama kompakt kalır.
+        # Yerinde değişiklik için chromosome[i] = ... kullanılmalı
+        return self._genes.tolist()
+    
+    @genes.setter
+    def genes(self, genes):
+        self._genes = genes if isinstance(genes, (np.ndarray, array)) else compact_genes(genes)
+        self._distance = None
+    
+    def __len__(self) -> int:
+        return len(self._genes)
+    
+    def __getitem__(self, idx):
+        return self._genes[idx]
+    
+    def __setitem__(self, idx, value):
+        self._genes[idx] = value
+        self._distance = None
+    
+    def invalidate(self):
+        # Kompakt dizi (ör. popülasyon satırı görünümü) dışarıdan yerinde değiştirildiyse çağrılmalı
+        self._distance = None
+    
+    @property
+    def fitness(self) -> float:
+        return self.calculate_fitness()
+    
+    @fitness.setter
+    def fitness(self, fitness: float):
+        self._distance = 1.0 / fitness if fitness > 0 else 0.0
     
     def calculate_fitness(self) -> float:
-        total_distance = 0.0
-        for i in range(len(self.genes)):
-            from_city = self.genes[i]
-            to_city = self.genes[(i + 1) % len(self.genes)]
-            total_distance += self.tsp_data.calculate_distance(from_city, to_city)
-        return 1.0 / total_distance if total_distance > 0 else 0
+        total_distance = self.get_total_distance()
+        return 1.0 / total_distance if 0 < total_distance < float('inf') else 0
     
     def get_total_distance(self) -> float:
-        return 1.0 / self.fitness if self.fitness > 0 else float('inf')
+        if self._distance is None:
+            self._distance = self.tsp_data.tour_length(self._genes)
+        return self._distance if self._distance > 0 else float('inf')
+
+
+class Population:
+    
+    def __init__(self, genes: np.ndarray, tsp_data: TSPData, distances: np.ndarray = None):
+        # genes: (popülasyon_boyutu x N) şehir indeksi matrisi, her satır bir tur
+        self.genes = genes
+        self.tsp_data = tsp_data
+        self.distances = tsp_data.tour_lengths(genes) if distances is None else np.asarray(distances, dtype=np.float64)
+        # Çift tampon: yeni nesil önceden ayrılmış ikinci tampona yazılır, sonra tamponlar yer değiştirir
+        self.next_genes = np.empty_like(self.genes)
+        self.next_distances = np.empty_like(self.distances)
+    
+    def swap(self):
+        self.genes, self.next_genes = self.next_genes, self.genes
+        self.distances, self.next_distances = self.next_distances, self.distances
+    
+    def __len__(self) -> int:
+        return len(self.genes)
+    
+    def best_index(self) -> int:
+        return int(np.argmin(self.distances))
+    
+    def chromosome(self, idx: int) -> Chromosome:
+        # Kopya: çift tampon bir sonraki nesilde bu satırın üzerine yazar
+        return Chromosome(compact_genes(self.genes[idx]), self.tsp_data, distance=float(self.distances[idx]))
 
 
 class GeneticAlgorithm:
     
-    def __init__(self, tsp_data: TSPData, population_size: int = 100):
+    def __init__(self, tsp_data: TSPData, population_size: int = 100, seed: int = None,
+                 selection=("rank", "roulette"), crossover: str = "cx", crossover_rate: float = 1.0,
+                 seeding: Dict[str, float] = None, on_generation: Callable[[dict], None] = None,
+                 cache_size: int = 0, reject_duplicates: bool = False, verify_deltas: bool = False,
+                 adaptive_operators: bool = False, adaptive_window: int = 20, restart_fraction: float = 0.0,
+                 restart_diversity: float = 0.1, diversity_interval: int = 10):
         self.tsp_data = tsp_data
         self.population_size = population_size
-        self.population: List[Chromosome] = []
+        self.rng = np.random.default_rng(seed)
+        # Her çift için listedeki yöntemlerden biri eşit olasılıkla seçilir
+        self.selection: List[SelectionStrategy] = [make_selection(s) for s in selection]
+        self.crossover_name = crossover
+        self.crossover = get_crossover(crossover)
+        self.crossover_rate = crossover_rate
+        # Başlatma karışımı, ör. {"nn": 0.2, "hilbert": 0.1}; kalan kısım rastgele ({} = tamamen rastgele)
+        self.seeding = seeding
+        self.population: Population = None
         self.generation = 0
         self.best_chromosome: Chromosome = None
         self.best_history: List[float] = []
+        self._local_search: LocalSearch = None
+        # Telemetri: aşama süreleri, tam ve artımlı (kenar farkı) değerlendirme sayaçları, nesil geri çağrıları
+        self.timer = PhaseTimer()
+        self.evaluations = 0
+        self.delta_evaluations = 0
+        self.callbacks: List[Callable[[dict], None]] = [] if on_generation is None else [on_generation]
+        # Tur kenar kümesi özetiyle anahtarlanan uzunluk önbelleği (cache_size=0 kapalı). Özet, matrisle
+        # değerlendirmeden pahalı; yalnızca değerlendirme pahalıyken (ör. özel uzaklık fonksiyonu) açılmalı
+        self.fitness_cache = FitnessCache(cache_size) if cache_size > 0 else None
+        # Popülasyonda zaten bulunan çocuklar yeniden mutasyona uğratılır (klon birikmesin)
+        self.reject_duplicates = reject_duplicates
+        self.duplicates_rejected = 0
+        # Hata ayıklama: her mutasyon/yerel arama kenar farkı tam hesapla doğrulanır (yavaş)
+        self.verify_deltas = verify_deltas
+        # Bilinen alt sınır (ör. lower_bound.held_karp_bound); run(target_gap=...) erken durdurma için kullanır
+        self.lower_bound: float = None
+        self.target_gap: float = None
+        # Uyarlamalı operatör seçimi: seçim yöntemi, çaprazlama/kopya (çaprazlama oranı) ve ekleme/kaydırma
+        # mutasyonu olasılıkları son adaptive_window nesildeki CPU saniyesi başına iyileşmeye göre ayarlanır
+        self.schedulers: Dict[str, OperatorScheduler] = None
+        if adaptive_operators:
+            self.schedulers = {
+                'selection': OperatorScheduler([s.name for s in self.selection], adaptive_window),
+                'crossover': OperatorScheduler([crossover, "copy"], adaptive_window,
+                                               initial=[crossover_rate, 1.0 - crossover_rate]),
+                'mutation': OperatorScheduler(["insert", "slide"], adaptive_window),
+            }
+        # Kısmi yeniden başlatma: her diversity_interval nesilde kenar entropisi ölçülür; restart_diversity altına
+        # düştüyse en kötü restart_fraction oranı yeniden başlatılır (elitler korunur). restart_fraction=0 kapalı
+        self.restart_fraction = restart_fraction
+        self.restart_diversity = restart_diversity
+        self.diversity_interval = diversity_interval
+        self.edge_diversity: float = None
+        self.restarts = 0
+        self._restart_fitness_time = 0.0
+        # İyileşme hızıyla sonlandırma (run(min_improvement_rate=...)): (zaman, en iyi) kayıtları
+        self.min_improvement_rate: float = None
+        self.rate_window = 5.0
+        self.progress = deque()
+        self._random_baseline: float = None
     
-    def initialize_population(self):
-        city_ids = list(self.tsp_data.cities.keys())
-        
-        for _ in range(self.population_size):
-            genes = city_ids.copy()
-            random.shuffle(genes)
-            self.population.append(Chromosome(genes, self.tsp_data))
+    def add_callback(self, callback: Callable[[dict], None]):
+        self.callbacks.append(callback)
+    
+    @property
+    def local_search(self) -> LocalSearch:
+        if self._local_search is None:
+            self._local_search = LocalSearch(self.tsp_data)
+        return self._local_search
+    
+    def initialize_population(self, verbose: bool = True):
+        genes = seed_population(self.tsp_data, self.population_size, self.rng, self.seeding)
+        self.population = Population(genes, self.tsp_data)
+        self.evaluations += self.population_size
         
-        self.population.sort(key=lambda x: x.fitness, reverse=True)
-        self.best_chromosome = self.population[0]
+        self.best_chromosome = self.population.chromosome(self.population.best_index())
         self.best_history.append(self.best_chromosome.get_total_distance())
-        print(f"Başlangıç En İyi Mesafe: {self.best_chromosome.get_total_distance():.2f}\n")
-    
-    def rank_based_selection(self) -> Chromosome:
-        sorted_pop = sorted(self.population, key=lambda x: x.fitness)
-        n = len(sorted_pop)
-        ranks = list(range(1, n + 1))
-        total_rank = sum(ranks)
-        probabilities = [rank / total_rank for rank in ranks]
-        return random.choices(sorted_pop, weights=probabilities, k=1)[0]
-    
-    def roulette_wheel_selection(self) -> Chromosome:
-        total_fitness = sum(c.fitness for c in self.population)
-        if total_fitness == 0:
-            return random.choice(self.population)
-        
-        pick = random.uniform(0, total_fitness)
-        current = 0
-        for chromosome in self.population:
-            current += chromosome.fitness
-            if current >= pick:
-                return chromosome
-        return self.population[-1]
+        self._record_progress()
+        if verbose:
+            logger.info("Başlangıç En İyi Mesafe: %.2f", self.best_chromosome.get_total_distance())
+    
+    def get_state(self) -> dict:
+        return {
+            'genes': self.population.genes,
+            'distances': self.population.distances,
+            'generation': self.generation,
+            'best_genes': np.asarray(self.best_chromosome.genes, dtype=np.int32),
+            'best_history': list(self.best_history),
+            'rng_state': self.rng.bit_generator.state,
+            'search_state': self.get_search_state(),
+        }
+    
+    def get_search_state(self) -> dict:
+        # Popülasyon dışındaki arama durumu: kol kredileri, önbellek içeriği (LRU sırasıyla), çeşitlilik sayaçları.
+        # Devam edilen iş bunlar olmadan başka olasılıklarla/önbellekle ilerler ve birebir aynı sonucu vermez
+        state = {
+            'edge_diversity': self.edge_diversity,
+            'restarts': self.restarts,
+            'duplicates_rejected': self.duplicates_rejected,
+        }
+        if self.schedulers is not None:
+            state['schedulers'] = {
+                key: {
+                    'names': scheduler.names,
+                    'credits': [list(credit) for credit in scheduler.credits],
+                    'uses': scheduler.uses.tolist(),
+                }
+                for key, scheduler in self.schedulers.items()
+            }
+        if self.fitness_cache is not None:
+            state['fitness_cache'] = {
+                'entries': list(self.fitness_cache.entries.items()),
+                'hits': self.fitness_cache.hits,
+                'misses': self.fitness_cache.misses,
+            }
+        return state
+    
+    def set_search_state(self, state: dict):
+        self.edge_diversity = state['edge_diversity']
+        self.restarts = state['restarts']
+        self.duplicates_rejected = state['duplicates_rejected']
+        # Kaydedilmemiş bileşen (seçenek sonradan açıldıysa) boş başlar; kol adları farklıysa krediler uyuşmaz
+        for key, saved in state.get('schedulers', {}).items():
+            scheduler = (self.schedulers or {}).get(key)
+            if scheduler is None:
+                continue
+            if saved['names'] != scheduler.names:
+                raise ValueError(f"Kontrol noktasındaki {key} operatörleri farklı: {', '.join(saved['names'])}")
+            scheduler.reset()
+            for credit, records in zip(scheduler.credits, saved['credits']):
+                credit.extend(tuple(record) for record in records)
+            scheduler.uses[:] = saved['uses']
+        saved = state.get('fitness_cache')
+        if saved is not None and self.fitness_cache is not None:
+            self.fitness_cache.clear()
+            self.fitness_cache.store([key for key, _ in saved['entries']],
+                                     np.array([value for _, value in saved['entries']], dtype=np.float64))
+            self.fitness_cache.hits = saved['hits']
+            self.fitness_cache.misses = saved['misses']
+    
+    def set_state(self, state: dict):
+        self.population = Population(state['genes'], self.tsp_data, state['distances'])
+        self.population_size = len(self.population)
+        self.generation = state['generation']
+        self.best_chromosome = Chromosome(compact_genes(state['best_genes']), self.tsp_data)
+        self.best_history = list(state['best_history'])
+        self.rng.bit_generator.state = state['rng_state']
+        if 'search_state' in state:
+            self.set_search_state(state['search_state'])
+    
+    def save_checkpoint(self, path: str):
+        # Tek .npz dosyası; önce geçici dosyaya yazılır, iş ortasında öldürülse bile eski kontrol noktası bozulmaz
+        state = self.get_state()
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, genes=state['genes'], distances=state['distances'],
+                     generation=np.int64(state['generation']), best_genes=state['best_genes'],
+                     best_history=np.asarray(state['best_history'], dtype=np.float64),
+                     rng_state=np.array(json.dumps(state['rng_state'])),
+                     search_state=np.array(json.dumps(state['search_state'])),
+                     instance=np.array([self.tsp_data.name, str(self.tsp_data.dimension)]))
+        os.replace(tmp, path)
+    
+    def resume(self, path: str) -> "GeneticAlgorithm":
+        with np.load(path, allow_pickle=False) as data:
+            name, dimension = data['instance'].tolist()
+            if int(dimension) != self.tsp_data.dimension:
+                raise ValueError(f"Kontrol noktası başka bir örneğe ait: {name} ({dimension} şehir)")
+            self.set_state({
+                'genes': data['genes'],
+                'distances': data['distances'],
+                'generation': int(data['generation']),
+                'best_genes': data['best_genes'],
+                'best_history': data['best_history'].tolist(),
+                'rng_state': json.loads(str(data['rng_state'])),
+            })
+            # Eski kontrol noktalarında arama durumu yok: yalnızca popülasyon ve RNG geri yüklenir
+            if 'search_state' in data.files:
+                self.set_search_state(json.loads(str(data['search_state'])))
+        return self
+    
+    def select_parents(self, n_pairs: int) -> np.ndarray:
+        strategy_of_pair = self.rng.integers(0, len(self.selection), size=n_pairs)
+        return self._draw_parents(strategy_of_pair)[0]
+    
+    def _draw_parents(self, strategy_of_pair: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # Seçim tabloları nesil başına bir kez kurulur, tüm ebeveynler tek seferde çekilir.
+        # Dönüş: (ebeveyn çiftleri, yöntem başına süre)
+        clock = time.perf_counter
+        parents = np.empty((len(strategy_of_pair), 2), dtype=np.int64)
+        seconds = np.zeros(len(self.selection))
+        for i, strategy in enumerate(self.selection):
+            pairs = np.flatnonzero(strategy_of_pair == i)
+            if len(pairs) == 0:
+                continue
+            t = clock()
+            strategy.prepare(self.population.distances)
+            parents[pairs] = strategy.draw(self.rng, 2 * len(pairs)).reshape(-1, 2)
+            seconds[i] = clock() - t
+        return parents, seconds
     
     def cycle_crossover(self, parent1: Chromosome, parent2: Chromosome) -> Tuple[Chromosome, Chromosome]:
-        size = len(parent1.genes)
-        child1_genes = [-1] * size
-        child2_genes = [-1] * size
-        visited = [False] * size
-        
-        while not all(visited):
-            start_idx = visited.index(False)
-            current_idx = start_idx
-            cycle_indices = []
-            
-            while not visited[current_idx]:
-                visited[current_idx] = True
-                cycle_indices.append(current_idx)
-                value_in_parent2 = parent2.genes[current_idx]
-                current_idx = parent1.genes.index(value_in_parent2)
-            
-            cycle_num = len([i for i in range(start_idx) if visited[i]]) // len(cycle_indices)
-            
-            for idx in cycle_indices:
-                if cycle_num % 2 == 0:
-                    child1_genes[idx] = parent1.genes[idx]
-                    child2_genes[idx] = parent2.genes[idx]
-                else:
-                    child1_genes[idx] = parent2.genes[idx]
-                    child2_genes[idx] = parent1.genes[idx]
+        child1, child2 = cycle_crossover(np.array([parent1.genes]), np.array([parent2.genes]))
+        return Chromosome(compact_genes(child1[0]), self.tsp_data), Chromosome(compact_genes(child2[0]), self.tsp_data)
+    
+    @staticmethod
+    def _rotate_segments(genes: np.ndarray, rows: np.ndarray, start: np.ndarray, end: np.ndarray, shift: np.ndarray):
+        # genes[rows] satırlarında [start, end] segmenti shift kadar sola döndürülür (yerinde)
+        positions = np.arange(genes.shape[1])[None, :]
+        start = start[:, None]
+        length = end[:, None] - start + 1
+        in_segment = (positions >= start) & (positions < start + length)
+        source = np.where(in_segment, start + (positions - start + shift[:, None]) % length, positions)
+        genes[rows] = np.take_along_axis(genes[rows], source, axis=1)
+    
+    def _insert_mutation_inplace(self, genes: np.ndarray, rows: np.ndarray, distances: np.ndarray) -> np.ndarray:
+        # Dönüş: satır başına kenar farkı (distances[rows] zaten güncellenmiş olur)
+        size = genes.shape[1]
+        k = len(rows)
+        delta = np.zeros(k)
+        if size < 2 or k == 0:
+            return delta
+        
+        remove_idx = self.rng.integers(0, size, size=k)
+        insert_idx = self.rng.integers(0, size - 1, size=k)
+        
+        if size > 3:
+            # Çıkan kenarlar (a,g), (g,b), (x,y); eklenen (a,b), (x,g), (g,y): üç kenar, O(1)
+            a = genes[rows, (remove_idx - 1) % size]
+            g = genes[rows, remove_idx]
+            b = genes[rows, (remove_idx + 1) % size]
+            # g çıkarıldıktan sonraki listede j. eleman: j < remove_idx ise j, değilse j + 1
+            before = (insert_idx - 1) % (size - 1)
+            x = genes[rows, np.where(before < remove_idx, before, before + 1)]
+            y = genes[rows, np.where(insert_idx < remove_idx, insert_idx, insert_idx + 1)]
+            dist = self.tsp_data.distances_between
+            delta = (dist(a, b) - dist(a, g) - dist(g, b)
+                     + dist(x, g) + dist(g, y) - dist(x, y)).astype(np.float64)
+            distances[rows] += delta
         
-        return Chromosome(child1_genes, self.tsp_data), Chromosome(child2_genes, self.tsp_data)
+        # pop + insert: [r, i] bir sola ya da [i, r] bir sağa kayar
+        start = np.minimum(remove_idx, insert_idx)
+        end = np.maximum(remove_idx, insert_idx)
+        shift = np.where(insert_idx >= remove_idx, 1, end - start)
+        self._rotate_segments(genes, rows, start, end, shift)
+        self._verify(genes, rows, distances, "insert_mutation")
+        return delta
     
     def insert_mutation(self, chromosome: Chromosome) -> Chromosome:
-        genes = chromosome.genes.copy()
-        if len(genes) < 2:
-            return Chromosome(genes, self.tsp_data)
-        
-        remove_idx = random.randint(0, len(genes) - 1)
-        gene = genes.pop(remove_idx)
-        insert_idx = random.randint(0, len(genes) - 1)
-        genes.insert(insert_idx, gene)
-        return Chromosome(genes, self.tsp_data)
+        # Çocuğun uzunluğu ebeveyninkinden kenar farkıyla türetilir (O(1))
+        genes = np.array([chromosome.genes])
+        distance = np.array([chromosome.get_total_distance()])
+        self._insert_mutation_inplace(genes, np.zeros(1, dtype=np.int64), distance)
+        self.delta_evaluations += 1
+        return Chromosome(compact_genes(genes[0]), self.tsp_data, distance=float(distance[0]))
     
-    def random_slide_mutation(self, chromosome: Chromosome) -> Chromosome:
-        genes = chromosome.genes.copy()
-        if len(genes) < 3:
-            return Chromosome(genes, self.tsp_data)
-        
-        start = random.randint(0, len(genes) - 2)
-        end = random.randint(start + 1, len(genes) - 1)
-        subset = genes[start:end + 1]
-        shift = random.randint(1, len(subset) - 1)
-        genes[start:end + 1] = subset[shift:] + subset[:shift]
-        return Chromosome(genes, self.tsp_data)
-    
-    def two_opt(self, chromosome: Chromosome) -> Chromosome:
-        best_genes = chromosome.genes.copy()
-        best_distance = chromosome.get_total_distance()
-        improved = True
-        
-        while improved:
-            improved = False
-            for i in range(len(best_genes) - 1):
-                for k in range(i + 2, len(best_genes)):
-
-                    new_genes = best_genes.copy()
-                    new_genes[i:k] = reversed(best_genes[i:k])
-                    
-                    new_chromosome = Chromosome(new_genes, self.tsp_data)
-                    new_distance = new_chromosome.get_total_distance()
-                    
-                    if new_distance < best_distance:
-                        best_genes = new_genes
-                        best_distance = new_distance
-                        improved = True
-                        break
-                if improved:
-                    break
+    def _slide_mutation_inplace(self, genes: np.ndarray, rows: np.ndarray, distances: np.ndarray) -> np.ndarray:
+        size = genes.shape[1]
+        k = len(rows)
+        delta = np.zeros(k)
+        if size < 3 or k == 0:
+            return delta
         
-        return Chromosome(best_genes, self.tsp_data)
-    
-    def three_opt(self, chromosome: Chromosome) -> Chromosome:
-        best_genes = chromosome.genes.copy()
-        best_distance = chromosome.get_total_distance()
-        improved = True
+        start = self.rng.integers(0, size - 1, size=k)
+        end = start + 1 + np.floor(self.rng.random(k) * (size - 1 - start)).astype(np.int64)
+        length = end - start + 1
+        shift = 1 + np.floor(self.rng.random(k) * (length - 1)).astype(np.int64)
         
-        while improved:
-            improved = False
-            n = len(best_genes)
-            
-            for i in range(n - 2):
-                for j in range(i + 2, n - 1):
-                    for k in range(j + 2, n + (1 if i > 0 else 0)):
-                        
-                        candidates = []
-                        
-                        candidates.append(best_genes[:])
-                        
-                        candidates.append(best_genes[:i] + best_genes[j:k] + best_genes[i:j] + best_genes[k:])
-                        
-                        candidates.append(best_genes[:i] + best_genes[j:k][::-1] + best_genes[i:j] + best_genes[k:])
-                        
-                        candidates.append(best_genes[:i] + best_genes[j:k] + best_genes[i:j][::-1] + best_genes[k:])
-                        
-                        candidates.append(best_genes[:i] + best_genes[i:j][::-1] + best_genes[j:k][::-1] + best_genes[k:])
-                        
-                        for candidate in candidates:
-                            new_chromosome = Chromosome(candidate, self.tsp_data)
-                            new_distance = new_chromosome.get_total_distance()
-                            
-                            if new_distance < best_distance:
-                                best_genes = candidate
-                                best_distance = new_distance
-                                improved = True
-                                break
-                        
-                        if improved:
-                            break
-                    if improved:
-                        break
-                if improved:
-                    break
+        if size > 3:
+            # Segment [s, e] s+shift noktasından bölünüp iki parçası yer değiştirir: üç kenar değişir
+            p = genes[rows, (start - 1) % size]
+            first = genes[rows, start]
+            u = genes[rows, start + shift - 1]
+            v = genes[rows, start + shift]
+            last = genes[rows, end]
+            nx = genes[rows, (end + 1) % size]
+            dist = self.tsp_data.distances_between
+            delta = (dist(p, v) + dist(last, first) + dist(u, nx)
+                     - dist(p, first) - dist(u, v) - dist(last, nx))
+            # Tüm turun döndürülmesi aynı döngüdür
+            delta = np.where(length == size, 0, delta).astype(np.float64)
+            distances[rows] += delta
         
-        return Chromosome(best_genes, self.tsp_data)
+        self._rotate_segments(genes, rows, start, end, shift)
+        self._verify(genes, rows, distances, "random_slide_mutation")
+        return delta
+    
+    def random_slide_mutation(self, chromosome: Chromosome) -> Chromosome:
+        # Çocuğun uzunluğu ebeveyninkinden kenar farkıyla türetilir (O(1))
+        genes = np.array([chromosome.genes])
+        distance = np.array([chromosome.get_total_distance()])
+        self._slide_mutation_inplace(genes, np.zeros(1, dtype=np.int64), distance)
+        self.delta_evaluations += 1
+        return Chromosome(compact_genes(genes[0]), self.tsp_data, distance=float(distance[0]))
+    
+    def two_opt(self, chromosome: Chromosome, time_budget: float = None) -> Chromosome:
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+        best_genes, gain = self.local_search.two_opt(chromosome.genes, deadline)
+        return self._improved(chromosome, best_genes, gain, "two_opt")
+    
+    def three_opt(self, chromosome: Chromosome, time_budget: float = None) -> Chromosome:
+        best_genes, gain = self.local_search.three_opt(chromosome.genes, time_budget)
+        return self._improved(chromosome, best_genes, gain, "three_opt")
+    
+    def _improved(self, chromosome: Chromosome, genes, gain: float, operator: str) -> Chromosome:
+        # Yerel arama hamlelerinin kazançları toplanmış gelir: yeni uzunluk tam hesap olmadan bulunur
+        distance = chromosome.get_total_distance() - gain
+        if self.verify_deltas:
+            self._check_distance(operator, self.tsp_data.tour_length(genes), distance)
+        return Chromosome(genes, self.tsp_data, distance=distance)
+    
+    def _verify(self, genes: np.ndarray, rows: np.ndarray, distances: np.ndarray, operator: str):
+        # Hata ayıklama modu: artımlı uzunluklar tam yeniden hesapla karşılaştırılır
+        if not self.verify_deltas or len(rows) == 0:
+            return
+        expected = self.tsp_data.tour_lengths(genes[rows])
+        for exact, incremental in zip(expected.tolist(), distances[rows].tolist()):
+            self._check_distance(operator, exact, incremental)
+    
+    @staticmethod
+    def _check_distance(operator: str, exact: float, incremental: float):
+        if abs(exact - incremental) > 1e-6 * max(1.0, abs(exact)):
+            raise AssertionError(f"{operator}: artımlı uzunluk {incremental} != tam hesap {exact}")
     
     def create_next_generation(self):
-        new_population = []
-        self.population.sort(key=lambda x: x.fitness, reverse=True)
-        new_population.append(copy.deepcopy(self.population[0]))
-        
-        while len(new_population) < self.population_size:
-            if random.random() < 0.5:
-                parent1 = self.rank_based_selection()
-                parent2 = self.rank_based_selection()
-            else:
-                parent1 = self.roulette_wheel_selection()
-                parent2 = self.roulette_wheel_selection()
-            
-            child1, child2 = self.cycle_crossover(parent1, parent2)
-            
-            if random.random() < 0.5:
-                child1 = self.insert_mutation(child1)
-                child2 = self.insert_mutation(child2)
-            else:
-                child1 = self.random_slide_mutation(child1)
-                child2 = self.random_slide_mutation(child2)
-            
-            new_population.append(child1)
-            if len(new_population) < self.population_size:
-                new_population.append(child2)
+        clock = time.perf_counter
+        t_start = clock()
+        evaluations = self.evaluations
+        delta_evaluations = self.delta_evaluations
+        population = self.population
+        genes = population.next_genes
+        distances = population.next_distances
+        size = self.population_size
+        n_pairs = size // 2
+        
+        # Elitizm: en iyi satır indeksiyle yeni tampona taşınır (deepcopy yok)
+        elite = population.best_index()
+        genes[0] = population.genes[elite]
+        distances[0] = population.distances[elite]
+        t_selection = clock()
         
-        self.population = new_population[:self.population_size]
+        # Çocuk c, satır 1 + c'ye yazılır; çift sayıda çocukta son çiftin ikinci çocuğu atılır
+        schedulers = self.schedulers
+        if schedulers is None:
+            parents = self.select_parents(n_pairs)
+        else:
+            strategy_of_pair = schedulers['selection'].sample(self.rng, n_pairs)
+            parents, selection_seconds = self._draw_parents(strategy_of_pair)
+        t_crossover = clock()
+        child_rows = 1 + np.arange(2 * n_pairs).reshape(n_pairs, 2)
+        valid = child_rows < size
+        if schedulers is None:
+            crossed = self.rng.random(n_pairs) < self.crossover_rate
+        else:
+            crossed = schedulers['crossover'].sample(self.rng, n_pairs) == 0
+        
+        # Çaprazlanmayan çocuklar ebeveyn kopyasıdır, uzunlukları zaten bilinir
+        copied = ~crossed[:, None] & valid
+        genes[child_rows[copied]] = population.genes[parents[copied]]
+        distances[child_rows[copied]] = population.distances[parents[copied]]
+        t_copy = clock()
+        
+        fitness_time = 0.0
+        if crossed.any():
+            child1, child2 = self.crossover(population.genes[parents[crossed, 0]], population.genes[parents[crossed, 1]],
+                                            self.rng, self.tsp_data)
+            rows1 = child_rows[crossed, 0]
+            rows2 = child_rows[crossed, 1]
+            keep2 = rows2 < size
+            genes[rows1] = child1
+            genes[rows2[keep2]] = child2[keep2]
+            crossed_rows = np.concatenate([rows1, rows2[keep2]])
+            t_fitness = clock()
+            self._evaluate_rows(genes, crossed_rows, distances)
+            fitness_time = clock() - t_fitness
+        t_mutation = clock()
+        
+        # Mutasyon yerinde uygulanır, tur uzunluğu değişen kenarlardan güncellenir
+        if schedulers is None:
+            insert_pair = self.rng.random(n_pairs) < 0.5
+        else:
+            insert_pair = schedulers['mutation'].sample(self.rng, n_pairs) == 0
+        use_insert = np.repeat(insert_pair, 2)[valid.ravel()]
+        rows = child_rows[valid]
+        insert_delta = self._insert_mutation_inplace(genes, rows[use_insert], distances)
+        t_slide = clock()
+        slide_delta = self._slide_mutation_inplace(genes, rows[~use_insert], distances)
+        self.delta_evaluations += len(rows)
+        t_credit = clock()
+        # Tek bireylik popülasyonda çift yok (yalnızca elit): kredilendirilecek deneme de yok
+        if schedulers is not None and n_pairs > 0:
+            # Çift başına kazanç: mutasyonda uzunluk azalışı; seçimde en iyi çocuğun popülasyon ortalamasından,
+            # çaprazlama/kopyada ebeveynlerin iyisinden kısalığı (ikisi de mutasyon sonrası)
+            pair_of_row = (rows - 1) // 2
+            mutation_gain = (np.bincount(pair_of_row[use_insert], np.maximum(0.0, -insert_delta), n_pairs)
+                             + np.bincount(pair_of_row[~use_insert], np.maximum(0.0, -slide_delta), n_pairs))
+            child_best = np.where(valid, distances[np.minimum(child_rows, size - 1)], np.inf).min(axis=1)
+            parent_best = population.distances[parents].min(axis=1)
+            shared = (t_credit - t_start) / n_pairs
+            mutation_seconds = [t_slide - t_mutation, t_credit - t_slide]
+            crossover_seconds = [t_mutation - t_copy, t_copy - t_crossover]
+            schedulers['selection'].credit(strategy_of_pair, population.distances.mean() - child_best,
+                                           selection_seconds, shared - selection_seconds.sum() / n_pairs)
+            schedulers['crossover'].credit(np.where(crossed, 0, 1), parent_best - child_best,
+                                           crossover_seconds, shared - sum(crossover_seconds) / n_pairs)
+            schedulers['mutation'].credit(np.where(insert_pair, 0, 1), mutation_gain,
+                                          mutation_seconds, shared - sum(mutation_seconds) / n_pairs)
+        t_cache = clock()
+        if self.fitness_cache is not None or self.reject_duplicates:
+            self._register_generation(genes, distances)
+        t_elitism = clock()
+        
+        population.swap()
         self.generation += 1
         
-        self.population.sort(key=lambda x: x.fitness, reverse=True)
-        if self.population[0].fitness > self.best_chromosome.fitness:
-            self.best_chromosome = self.population[0]
+        best = self.population.best_index()
+        if self.population.distances[best] < self.best_chromosome.get_total_distance():
+            self.best_chromosome = self.population.chromosome(best)
         
         self.best_history.append(self.best_chromosome.get_total_distance())
+        t_diversity = clock()
+        self._restart_fitness_time = 0.0
+        if self.restart_fraction > 0 and self.generation % self.diversity_interval == 0:
+            self.measure_diversity()
+            if self.edge_diversity < self.restart_diversity:
+                self.partial_restart(self.restart_fraction)
+        t_end = clock()
+        self._record_progress(t_end)
+        
+        # Yeniden başlatılan turların değerlendirmesi fitness aşamasına sayılır
+        self.timer.record(selection=t_crossover - t_selection, crossover=t_mutation - t_crossover - fitness_time,
+                          fitness=fitness_time + self._restart_fitness_time, mutation=t_credit - t_mutation,
+                          elitism=(t_selection - t_start) + (t_diversity - t_elitism),
+                          cache=t_elitism - t_cache, scheduler=t_cache - t_credit,
+                          diversity=t_end - t_diversity - self._restart_fitness_time)
+        if self.callbacks:
+            stats = self.generation_stats(t_end - t_start, self.evaluations - evaluations,
+                                          self.delta_evaluations - delta_evaluations)
+            for callback in self.callbacks:
+                callback(stats)
+    
+    def generation_stats(self, seconds: float, evaluations: int, delta_evaluations: int) -> dict:
+        # Yalnızca geri çağrı varsa hesaplanır
+        distances = self.population.distances
+        stats = {
+            'generation': self.generation,
+            'best': self.best_chromosome.get_total_distance(),
+            'mean': float(distances.mean()),
+            # Farklı tur uzunluğu oranı: 1 = hepsi farklı, 1/P = popülasyon tek tura çökmüş
+            'diversity': len(np.unique(distances)) / len(distances),
+            # Örneklenmiş ortalama kenar uzaklığı (nesle bağlı tohum: ana rastgele sayı dizisine dokunmaz)
+            'edge_distance': sampled_edge_distance(self.population.genes, np.random.default_rng(self.generation)),
+            'evaluations': self.evaluations,
+            'delta_evaluations': self.delta_evaluations,
+            'evals_per_sec': (evaluations + delta_evaluations) / seconds if seconds > 0 else 0.0,
+            'cache_hits': 0 if self.fitness_cache is None else self.fitness_cache.hits,
+            'cache_misses': 0 if self.fitness_cache is None else self.fitness_cache.misses,
+            'cache_hit_rate': 0.0 if self.fitness_cache is None else self.fitness_cache.hit_rate,
+            'duplicates_rejected': self.duplicates_rejected,
+            'ms_total': seconds * 1000,
+        }
+        if self.lower_bound:
+            stats['gap'] = self.gap()
+        # Anahtarlar her nesilde aynı olmalı (CSV başlığı ilk satırdan alınır); ölçülmediyse None
+        stats['edge_entropy'] = self.edge_diversity
+        stats['restarts'] = self.restarts
+        for phase, value in self.timer.last.items():
+            stats[f"ms_{phase}"] = value * 1000
+        # Operatör karışımı: bir sonraki nesilde her operatörün seçilme olasılığı
+        for scheduler in (self.schedulers or {}).values():
+            for name, probability in scheduler.mix().items():
+                stats[f"p_{name}"] = probability
+        return stats
+    
+    def _evaluate_rows(self, genes: np.ndarray, rows: np.ndarray, distances: np.ndarray):
+        if self.fitness_cache is None:
+            distances[rows] = self.tsp_data.tour_lengths(genes[rows])
+            self.evaluations += len(rows)
+            return
+        
+        # Yalnızca önbellekte olmayan turlar değerlendirilir
+        keys = tour_keys(genes[rows])
+        values = self.fitness_cache.lookup(keys)
+        miss = np.isnan(values)
+        if miss.any():
+            values[miss] = self.tsp_data.tour_lengths(genes[rows[miss]])
+            self.fitness_cache.store([k for k, m in zip(keys, miss) if m], values[miss])
+            self.evaluations += int(miss.sum())
+        distances[rows] = values
+    
+    def _register_generation(self, genes: np.ndarray, distances: np.ndarray, max_retries: int = 3):
+        keys = tour_keys(genes)
+        
+        if self.reject_duplicates:
+            # Satır 0 (elit) önce gelir; daha önce görülen anahtarlar kopyadır
+            for _ in range(max_retries):
+                seen = set()
+                duplicates = []
+                for row, key in enumerate(keys):
+                    if key in seen:
+                        duplicates.append(row)
+                    seen.add(key)
+                if not duplicates:
+                    break
+                duplicates = np.array(duplicates)
+                self.duplicates_rejected += len(duplicates)
+                self._slide_mutation_inplace(genes, duplicates, distances)
+                self.delta_evaluations += len(duplicates)
+                for row, key in zip(duplicates.tolist(), tour_keys(genes[duplicates])):
+                    keys[row] = key
+        
+        if self.fitness_cache is not None:
+            self.fitness_cache.store(keys, distances)
+    
+    def measure_diversity(self) -> float:
+        # Normalize kenar entropisi (diversity.normalized_edge_entropy)
+        self.edge_diversity = normalized_edge_entropy(self.population.genes)
+        return self.edge_diversity
     
-    def should_terminate(self, max_generations: int, stagnation_limit: int) -> bool:
+    def partial_restart(self, fraction: float) -> int:
+        # En kötü turlar başlatma karışımından (seeding) yeni turlarla değiştirilir; en iyi satırlar korunur
+        population = self.population
+        count = min(int(fraction * self.population_size), self.population_size - 1)
+        if count <= 0:
+            return 0
+        worst = np.argsort(population.distances, kind="stable")[-count:]
+        population.genes[worst] = seed_population(self.tsp_data, count, self.rng, self.seeding)
+        t_fitness = time.perf_counter()
+        population.distances[worst] = self.tsp_data.tour_lengths(population.genes[worst])
+        self._restart_fitness_time += time.perf_counter() - t_fitness
+        self.evaluations += count
+        self.restarts += 1
+        logger.debug("Nesil %d: kenar entropisi %.3f, %d tur yeniden başlatıldı", self.generation,
+                     self.edge_diversity, count)
+        return count
+    
+    def _record_progress(self, now: float = None):
+        if self.min_improvement_rate is None:
+            return
+        now = time.perf_counter() if now is None else now
+        self.progress.append((now, self.best_chromosome.get_total_distance()))
+        # Pencerenin başındaki kayıt hız hesabı için tutulur, daha eskiler atılır
+        while len(self.progress) > 2 and self.progress[1][0] <= now - self.rate_window:
+            self.progress.popleft()
+    
+    def improvement_rate(self) -> float:
+        # Son rate_window saniyede en iyi uzunluğun saniye başına göreli azalışı; pencere dolmadıysa None
+        if len(self.progress) < 2:
+            return None
+        (start, before), (now, best) = self.progress[0], self.progress[-1]
+        if now - start < self.rate_window or best <= 0:
+            return None
+        return (before - best) / best / (now - start)
+    
+    def random_baseline(self, samples: int = 100) -> float:
+        # Sezgisel başlatmanın katkısını ayırmak için referans: rastgele turların en iyisi.
+        # Sabit tohumlu ayrı üreteç: ana dizi değişmez
+        if self._random_baseline is None:
+            tours = random_tours(self.tsp_data, samples, np.random.default_rng(0))
+            self._random_baseline = float(self.tsp_data.tour_lengths(tours).min())
+        return self._random_baseline
+    
+    def improvement(self) -> float:
+        # GA'nın (ve yerel aramanın) başlangıç en iyisine göre yüzde iyileşmesi
+        initial = self.best_history[0]
+        return (initial - self.best_chromosome.get_total_distance()) / initial * 100
+    
+    def random_improvement(self) -> float:
+        # En iyi turun rastgele turlara göre yüzde iyileşmesi (sezgisel başlatma + GA)
+        baseline = self.random_baseline()
+        return (baseline - self.best_chromosome.get_total_distance()) / baseline * 100
+    
+    def gap(self) -> float:
+        # En iyi turun alt sınıra göreli farkı; optimuma fark en fazla bu kadar
+        return (self.best_chromosome.get_total_distance() - self.lower_bound) / self.lower_bound
+    
+    def should_terminate(self, max_generations: int, stagnation_limit: int, deadline: float = None) -> bool:
+        if self.lower_bound and self.target_gap is not None and self.gap() <= self.target_gap:
+            logger.info("Sonlandırma: alt sınıra fark %.2f%% (hedef %.2f%%)", self.gap() * 100, self.target_gap * 100)
+            return True
+        
         if self.generation >= max_generations:
-            print(f"\n Sonlandırma: {max_generations} nesil tamamlandı")
+            logger.info("Sonlandırma: %d nesil tamamlandı", max_generations)
+            return True
+        
+        if deadline is not None and time.perf_counter() >= deadline:
+            logger.info("Sonlandırma: süre doldu (%d nesil)", self.generation)
             return True
         
-        if len(self.best_history) >= stagnation_limit:
+        if self.min_improvement_rate is not None:
+            # Eşit nesil sayısı yerine iyileşme hızı: büyük örneklerde yavaş ama süren iyileşme kesilmez,
+            # çökmüş popülasyonda boşa süre harcanmaz
+            rate = self.improvement_rate()
+            if rate is not None and rate < self.min_improvement_rate:
+                logger.info("Sonlandırma: iyileşme hızı %.4f%%/sn (en az %.4f%%/sn, son %.0f sn)", rate * 100,
+                            self.min_improvement_rate * 100, self.rate_window)
+                return True
+        
+        if stagnation_limit is not None and len(self.best_history) >= stagnation_limit:
             recent_bests = self.best_history[-stagnation_limit:]
             if len(set(recent_bests)) == 1:
-                print(f"\n Sonlandırma: {stagnation_limit} nesil boyunca iyileşme yok")
+                logger.info("Sonlandırma: %d nesil boyunca iyileşme yok", stagnation_limit)
                 return True
+        
         return False
     
-    def run(self, max_generations: int = 100, stagnation_limit: int = 5, verbose: bool = True, use_local_search: bool = False):
-        self.initialize_population()
+    def run(self, max_generations: int = 100, stagnation_limit: int = None, verbose: bool = True,
+            use_local_search: bool = False, time_budget: float = None, checkpoint_path: str = None,
+            checkpoint_interval: float = 60.0, lower_bound: float = None, target_gap: float = None,
+            min_improvement_rate: float = None, rate_window: float = 5.0):
+        # Anytime: süre dolduğunda o ana kadarki en iyi tur döner. Popülasyon varsa (ör. resume sonrası) kaldığı yerden devam eder.
+        # lower_bound + target_gap: en iyi tur alt sınıra target_gap (ör. 0.02 = %2) kadar yaklaşınca durur.
+        # min_improvement_rate (ör. 1e-4 = saniyede %0.01): son rate_window saniyedeki iyileşme hızı bunun altına
+        # düşünce durur. stagnation_limit yalnızca verilirse uygulanır (ikisi de verilirse ilk tetiklenen durdurur);
+        # ikisi de verilmezse hız kuralı DEFAULT_MIN_IMPROVEMENT_RATE ile çalışır. Sezgisel başlatmada elit turu
+        # geçmek çok nesil sürdüğünden "ardışık N eşit nesil" kuralı küçük N ile erken durur
+        start = time.perf_counter()
+        if min_improvement_rate is None and stagnation_limit is None:
+            min_improvement_rate = DEFAULT_MIN_IMPROVEMENT_RATE
+        self.min_improvement_rate = min_improvement_rate
+        self.rate_window = rate_window
+        self.progress.clear()
+        if self.population is not None:
+            self._record_progress()
+        if lower_bound is not None:
+            self.lower_bound = lower_bound
+        self.target_gap = target_gap
+        deadline = None if time_budget is None else start + time_budget
+        # Yerel arama istenirse bütçenin %20'si ona ayrılır
+        ga_deadline = None if deadline is None else start + time_budget * (0.8 if use_local_search else 1.0)
+        
+        if self.population is None:
+            self.initialize_population(verbose)
         
-        while not self.should_terminate(max_generations, stagnation_limit):
-            self.create_next_generation()
-            if verbose and self.generation % 10 == 0:
-                print(f"Nesil {self.generation}: En İyi Mesafe = {self.best_chromosome.get_total_distance():.2f}")
+        last_checkpoint = time.perf_counter()
+        try:
+            while not self.should_terminate(max_generations, stagnation_limit, ga_deadline):
+                self.create_next_generation()
+                
+                if verbose and self.generation % 10 == 0:
+                    logger.info("Nesil %d: En İyi Mesafe = %.2f", self.generation, self.best_chromosome.get_total_distance())
+                
+                if checkpoint_path and time.perf_counter() - last_checkpoint >= checkpoint_interval:
+                    self.save_checkpoint(checkpoint_path)
+                    last_checkpoint = time.perf_counter()
+        finally:
+            # Kesintide (Ctrl+C, hata) de son durum diske yazılır
+            if checkpoint_path:
+                self.save_checkpoint(checkpoint_path)
         
         if use_local_search:
-            print("\n2-opt optimizasyonu uygulanıyor...")
-            self.best_chromosome = self.two_opt(self.best_chromosome)
-            print(f"2-opt sonrası: {self.best_chromosome.get_total_distance():.2f}")
+            logger.info("2-opt optimizasyonu uygulanıyor...")
+            remaining = None if deadline is None else max(0.0, deadline - time.perf_counter())
+            self.best_chromosome = self.two_opt(self.best_chromosome, remaining)
+            logger.info("2-opt sonrası: %.2f", self.best_chromosome.get_total_distance())
             
-            print("3-opt optimizasyonu uygulanıyor...")
-            self.best_chromosome = self.three_opt(self.best_chromosome)
-            print(f"3-opt sonrası: {self.best_chromosome.get_total_distance():.2f}")
+            logger.info("3-opt optimizasyonu uygulanıyor...")
+            remaining = None if deadline is None else max(0.0, deadline - time.perf_counter())
+            self.best_chromosome = self.three_opt(self.best_chromosome, remaining)
+            logger.info("3-opt sonrası: %.2f", self.best_chromosome.get_total_distance())
         
-        print(f"\nSonuç: {self.generation} nesil, En İyi Mesafe: {self.best_chromosome.get_total_distance():.2f}")
+        logger.info("Sonuç: %d nesil, En İyi Mesafe: %.2f", self.generation, self.best_chromosome.get_total_distance())
+        if self.lower_bound:
+            logger.info("Alt sınır: %.0f, fark: %.2f%%", self.lower_bound, self.gap() * 100)
+        if self.restarts:
+            logger.info("Kısmi yeniden başlatma: %d kez", self.restarts)
+        if self.fitness_cache is not None:
+            logger.info("Uzunluk önbelleği: %%%.1f isabet (%d isabet, %d ıska)", self.fitness_cache.hit_rate * 100,
+                        self.fitness_cache.hits, self.fitness_cache.misses)
+        if self.schedulers:
+            mix = {name: p for scheduler in self.schedulers.values() for name, p in scheduler.mix().items()}
+            logger.info("Operatör karışımı: %s", ", ".join(f"{name} {p:.0%}" for name, p in mix.items()))
         return self.best_chromosome
 
 
 def main():
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     
     current_dir = os.path.dirname(os.path.abspath(__file__))
     tsp_files = ["berlin52.tsp", "att48.tsp", "a280.tsp", "att532.tsp"]
@@ -328,29 +1044,33 @@ def main():
         print("="*60)
         
         tsp_data = TSPData(filepath)
+        print(f"Şehir Sayısı: {tsp_data.dimension}")
         ga = GeneticAlgorithm(tsp_data, population_size=100)
         
-        use_local = tsp_data.dimension <= 100
-        ga.run(max_generations=100, stagnation_limit=5, use_local_search=use_local)
+        # Sezgisel elit turu geçmek binlerce nesil sürebilir: nesil sınırı yerine süre bütçesi ve iyileşme hızı
+        ga.run(max_generations=100000, time_budget=60, use_local_search=True)
         
-        improvement = ((ga.best_history[0] - ga.best_chromosome.get_total_distance()) / ga.best_history[0] * 100)
         results.append({
             'file': filename,
             'cities': tsp_data.dimension,
             'generations': ga.generation,
             'best': ga.best_chromosome.get_total_distance(),
-            'improvement': improvement,
-            'local_search': 'Evet' if use_local else 'Hayır'
+            'initial': ga.best_history[0],
+            'improvement': ga.improvement(),
+            'random_improvement': ga.random_improvement(),
+            'local_search': 'Evet'
         })
     
     print("\n" + "="*60)
     print("ÖZET")
     print("="*60)
-    print(f"{'Dosya':<15} {'Şehir':<8} {'Nesil':<8} {'En İyi':<12} {'İyileşme':<10} {'2/3-opt':<8}")
-    print("-"*70)
+    print(f"{'Dosya':<15} {'Şehir':<8} {'Nesil':<8} {'Başlangıç':<12} {'En İyi':<12} {'İyileşme':>10} "
+          f"{'Rastgeleye göre':>16} {'2/3-opt':<8}")
+    print("-"*94)
     for r in results:
-        print(f"{r['file']:<15} {r['cities']:<8} {r['generations']:<8} {r['best']:<12.2f} {r['improvement']:<10.2f}% {r['local_search']:<8}")
-    print("="*70 + "\n")
+        print(f"{r['file']:<15} {r['cities']:<8} {r['generations']:<8} {r['initial']:<12.2f} {r['best']:<12.2f} "
+              f"{r['improvement']:>9.2f}% {r['random_improvement']:>15.2f}% {r['local_search']:<8}")
+    print("="*94 + "\n")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,178 @@
+# Kaan Kara - 220404046
+
+import mmap
+import os
+import re
+from typing import Dict
+
+import numpy as np
+
+
+CACHE_VERSION = 1
+CHUNK_SIZE = 1 << 22
+
+COORD_TYPES = ("EUC_2D", "ATT", "CEIL_2D", "GEO")
+MATRIX_FORMATS = ("FULL_MATRIX", "UPPER_ROW", "LOWER_ROW", "UPPER_DIAG_ROW", "LOWER_DIAG_ROW")
+
+# Bölüm sonu: harfle başlayan ilk satır (EOF ya da sonraki bölüm anahtar kelimesi)
+_KEYWORD_LINE = re.compile(rb"^[ \t]*[A-Za-z]", re.MULTILINE)
+
+
+def cache_path(path: str) -> str:
+    return path + ".npz"
+
+
+def _section_end(mm: mmap.mmap, start: int) -> int:
+    match = _KEYWORD_LINE.search(mm, start)
+    return len(mm) if match is None else match.start()
+
+
+def _read_numbers(mm: mmap.mmap, start: int, end: int, count: int = None) -> np.ndarray:
+    # Bölüm, satır sınırında kesilen parçalar halinde doğrudan float64 diziye yazılır; dosyanın tamamı belleğe alınmaz
+    out = np.empty(count if count is not None else 0, dtype=np.float64)
+    filled = 0
+    pos = start
+    while pos < end:
+        stop = min(end, pos + CHUNK_SIZE)
+        if stop < end:
+            newline = mm.rfind(b"\n", pos, stop)
+            stop = newline + 1 if newline >= pos else stop
+        values = np.fromstring(mm[pos:stop], dtype=np.float64, sep=" ")
+        if filled + len(values) > len(out):
+            if count is not None:
+                raise ValueError(f"Beklenenden fazla sayı: {count}")
+            out = np.resize(out, max(2 * len(out), filled + len(values)))
+        out[filled:filled + len(values)] = values
+        filled += len(values)
+        pos = stop
+    if count is not None and filled != count:
+        raise ValueError(f"Eksik veri: {count} sayı beklenirken {filled} okundu")
+    return out[:filled]
+
+
+def _node_section(mm: mmap.mmap, start: int, dimension: int):
+    end = _section_end(mm, start)
+    rows = _read_numbers(mm, start, end, None if dimension is None else 3 * dimension).reshape(-1, 3)
+    return rows[:, 0].astype(np.int64), np.ascontiguousarray(rows[:, 1:3])
+
+
+def _explicit_matrix(values: np.ndarray, dimension: int, fmt: str) -> np.ndarray:
+    matrix = np.zeros((dimension, dimension), dtype=np.int32)
+    if fmt == "FULL_MATRIX":
+        matrix[...] = values.reshape(dimension, dimension)
+        return matrix
+
+    # Satır satır üçgen biçimler: triu/tril indeksleri zaten satır öncelikli sıradadır
+    if fmt == "UPPER_ROW":
+        rows, cols = np.triu_indices(dimension, 1)
+    elif fmt == "UPPER_DIAG_ROW":
+        rows, cols = np.triu_indices(dimension, 0)
+    elif fmt == "LOWER_ROW":
+        rows, cols = np.tril_indices(dimension, -1)
+    else:
+        rows, cols = np.tril_indices(dimension, 0)
+    matrix[rows, cols] = values
+    matrix[cols, rows] = values
+    return matrix
+
+
+def _triangle_size(dimension: int, fmt: str) -> int:
+    if fmt == "FULL_MATRIX":
+        return dimension * dimension
+    if fmt in ("UPPER_ROW", "LOWER_ROW"):
+        return dimension * (dimension - 1) // 2
+    return dimension * (dimension + 1) // 2
+
+
+def parse_tsplib(path: str) -> Dict[str, object]:
+    header: Dict[str, str] = {}
+    result: Dict[str, object] = {}
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        while True:
+            line = mm.readline()
+            if not line:
+                break
+            line = line.decode("utf-8", errors="replace").strip()
+            if not line:
+                continue
+            if line == "EOF":
+                break
+
+            key, _, value = line.partition(":")
+            key = key.strip()
+            value = value.strip()
+            dimension = int(header["DIMENSION"]) if "DIMENSION" in header else None
+
+            if key == "NODE_COORD_SECTION":
+                result["city_ids"], result["coords"] = _node_section(mm, mm.tell(), dimension)
+                mm.seek(_section_end(mm, mm.tell()))
+            elif key == "DISPLAY_DATA_SECTION":
+                result["display_ids"], result["display_coords"] = _node_section(mm, mm.tell(), dimension)
+                mm.seek(_section_end(mm, mm.tell()))
+            elif key == "EDGE_WEIGHT_SECTION":
+                fmt = header.get("EDGE_WEIGHT_FORMAT", "FULL_MATRIX")
+                if fmt not in MATRIX_FORMATS:
+                    raise ValueError(f"Desteklenmeyen EDGE_WEIGHT_FORMAT: {fmt}")
+                if dimension is None:
+                    raise ValueError("EDGE_WEIGHT_SECTION için DIMENSION gerekli")
+                end = _section_end(mm, mm.tell())
+                values = _read_numbers(mm, mm.tell(), end, _triangle_size(dimension, fmt))
+                result["distance_matrix"] = _explicit_matrix(values, dimension, fmt)
+                mm.seek(end)
+            elif key.endswith("_SECTION"):
+                # Desteklenmeyen bölümler (ör. FIXED_EDGES_SECTION) atlanır
+                mm.seek(_section_end(mm, mm.tell()))
+            else:
+                header[key] = value
+
+    edge_weight_type = header.get("EDGE_WEIGHT_TYPE", "EUC_2D")
+    if edge_weight_type != "EXPLICIT" and edge_weight_type not in COORD_TYPES:
+        raise ValueError(f"Desteklenmeyen EDGE_WEIGHT_TYPE: {edge_weight_type}")
+
+    if edge_weight_type == "EXPLICIT":
+        if "distance_matrix" not in result:
+            raise ValueError("EXPLICIT örnekte EDGE_WEIGHT_SECTION yok")
+        n = len(result["distance_matrix"])
+        # Koordinat yoksa (çizim/komşuluk için) DISPLAY_DATA ya da sıfırlar kullanılır
+        result["city_ids"] = result.pop("display_ids", np.arange(1, n + 1, dtype=np.int64))
+        result["coords"] = result.pop("display_coords", np.zeros((n, 2), dtype=np.float64))
+    elif "coords" not in result:
+        raise ValueError("NODE_COORD_SECTION bulunamadı")
+
+    result.pop("display_ids", None)
+    result.pop("display_coords", None)
+    result["name"] = header.get("NAME", os.path.splitext(os.path.basename(path))[0])
+    result["edge_weight_type"] = edge_weight_type
+    return result
+
+
+def load_tsplib(path: str, use_cache: bool = True) -> Dict[str, object]:
+    # Ayrıştırılan örnek kaynağın yanına .npz olarak yazılır; kaynak değişmediyse tekrar okumalar milisaniyeler sürer
+    stat = os.stat(path)
+    stamp = np.array([CACHE_VERSION, stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+    cached = cache_path(path)
+
+    if use_cache and os.path.exists(cached):
+        try:
+            with np.load(cached, allow_pickle=False) as data:
+                if np.array_equal(data["stamp"], stamp):
+                    result = {key: data[key] for key in data.files if key != "stamp"}
+                    result["name"] = str(result["name"])
+                    result["edge_weight_type"] = str(result["edge_weight_type"])
+                    return result
+        except (OSError, ValueError, KeyError):
+            pass
+
+    result = parse_tsplib(path)
+    if use_cache:
+        tmp = f"{cached}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                np.savez(f, stamp=stamp, **result)
+            os.replace(tmp, cached)
+        except OSError:
+            # Salt okunur dizin: önbelleksiz devam
+            if os.path.exists(tmp):
+                os.remove(tmp)
+    return result
@@ -1,38 +1,27 @@
 #!/usr/bin/env python3
 # Kaan Kara - 220404046
+import os
 import random
+import sys
 
-def generate_population(size=100):
+# Ortak N-vezir motoru üst klasörde (Mahyar/nqueens.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import nqueens
+
+def generate_population(size=100, n=8):
 
     population = []
     
     for _ in range(size):
-        genotype = [1, 2, 3, 4, 5, 6, 7, 8]
+        genotype = list(range(1, n + 1))
         random.shuffle(genotype)
         population.append(genotype)
     
     return population
 
 def calculate_fitness(genotype):
-
-    n = len(genotype)
-    total_pairs = n * (n - 1) // 2
-    attacking_pairs = 0
-    
-    for i in range(n):
-        for j in range(i + 1, n):
-
-            col1, row1 = i, genotype[i] - 1
-            col2, row2 = j, genotype[j] - 1
-            
-            col_diff = abs(col1 - col2)
-            row_diff = abs(row1 - row2)
-            
-            if col_diff == row_diff:
-                attacking_pairs += 1
-    
-    fitness = total_pairs - attacking_pairs
-    return fitness
+    # C(n, 2) - çapraz çatışma; çatışmalar çapraz sayaçlarıyla O(n)
+    return nqueens.calculate_fitness(genotype)
 
 # Örnek Kullanım
 if __name__ == "__main__":
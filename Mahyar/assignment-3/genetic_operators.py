@@ -2,6 +2,24 @@
 # Kaan Kara - 220404046
 
 import random
+import sys
+import timeit
+
+import numpy as np
+
+
+def tournament_selection_indices(fitness_scores, k=1, tournament_size=3, rng=None):
+    # k turnuva tek seferde: her satırda iadesiz tournament_size aday, kazananın indeksi döner.
+    # Satır başına O(tournament_size): j. aday kalan n - j birey arasından çekilip önceki adayların üstüne kaydırılır
+    rng = rng or np.random.default_rng()
+    fitness_scores = np.asarray(fitness_scores)
+    n = len(fitness_scores)
+    candidates = rng.integers(0, n - np.arange(tournament_size), size=(k, tournament_size))
+    for j in range(1, tournament_size):
+        for taken in np.sort(candidates[:, :j], axis=1).T:
+            candidates[:, j] += candidates[:, j] >= taken
+    winners = np.argmax(fitness_scores[candidates], axis=1)
+    return candidates[np.arange(k), winners]
 
 
 def tournament_selection(population, fitness_scores, tournament_size=3):
@@ -15,8 +33,8 @@ def tournament_selection(population, fitness_scores, tournament_size=3):
             best_fitness = fitness_scores[idx]
             best_index = idx
 
-
-    return population[best_index].copy()
+    # Kopya yok: crossover ve mutate ebeveyni değiştirmez
+    return population[best_index]
 
 
 def crossover(parent1, parent2):
@@ -25,18 +43,40 @@ def crossover(parent1, parent2):
     
     crossover_point = random.randint(1, n - 1)
     
-    child = []
+    child = list(parent1[:crossover_point])
     
-    for i in range(crossover_point):
-        child.append(parent1[i])
+    # Üyelik bitmap'i: "gene not in child" kontrolü O(1), toplam O(N)
+    in_child = bytearray(max(max(parent1), max(parent2)) + 1)
+    for gene in child:
+        in_child[gene] = 1
     
     for gene in parent2:
-        if gene not in child:
+        if not in_child[gene]:
             child.append(gene)
     
     return child
 
 
+def crossover_population(parents1, parents2, rng=None):
+    # Toplu tek noktalı sıralı çaprazlama: (B x N) ebeveyn dizileri, genler 1..N
+    rng = rng or np.random.default_rng()
+    parents1 = np.asarray(parents1)
+    parents2 = np.asarray(parents2)
+    batch, n = parents1.shape
+    rows = np.arange(batch)[:, None]
+    positions = np.arange(n)[None, :]
+
+    crossover_points = rng.integers(1, n, size=(batch, 1))
+    in_prefix = np.zeros((batch, n + 1), dtype=bool)
+    in_prefix[rows, parents1] = positions < crossover_points
+
+    # Ebeveyn 2'nin önekte olmayan genleri, sırası korunarak başa alınır
+    order = np.argsort(in_prefix[rows, parents2], axis=1, kind="stable")
+    remaining = parents2[rows, order]
+    tail = remaining[rows, np.maximum(positions - crossover_points, 0)]
+    return np.where(positions < crossover_points, parents1, tail)
+
+
 def mutate(genotype, mutation_rate=0.05):
 
     mutated = genotype.copy()
@@ -49,7 +89,53 @@ def mutate(genotype, mutation_rate=0.05):
     return mutated
 
 
+def mutate_population(population, mutation_rate=0.05, rng=None):
+    # Tüm popülasyon dizisine tek seferde takas mutasyonu (yerinde)
+    rng = rng or np.random.default_rng()
+    batch, n = population.shape
+    rows = np.flatnonzero(rng.random(batch) < mutation_rate)
+    idx1 = rng.integers(0, n, size=len(rows))
+    idx2 = (idx1 + rng.integers(1, n, size=len(rows))) % n
+    first = population[rows, idx1]
+    population[rows, idx1] = population[rows, idx2]
+    population[rows, idx2] = first
+    return population
+
+
+def _micro(func, number, repeat=5):
+    # Çağrı başına en iyi süre (µs)
+    return min(timeit.repeat(func, repeat=repeat, number=number)) / number * 1e6
+
+
+def benchmark_operators(n=8, population_size=100, repeat=5, number=200):
+    # Mikro-benchmark: her operatör için çağrı başına en iyi süre (µs)
+    rng = np.random.default_rng(0)
+    population = np.array([rng.permutation(n) + 1 for _ in range(population_size)])
+    fitness_scores = rng.random(population_size)
+    population_list = population.tolist()
+    parent1, parent2 = population_list[0], population_list[1]
+
+    cases = {
+        'tournament_selection': lambda: tournament_selection(population_list, fitness_scores),
+        'tournament_selection_indices (tüm nesil)': lambda: tournament_selection_indices(
+            fitness_scores, population_size, rng=rng),
+        'crossover': lambda: crossover(parent1, parent2),
+        'crossover_population (tüm nesil)': lambda: crossover_population(population, population[::-1], rng),
+        'mutate': lambda: mutate(parent1, mutation_rate=1.0),
+        'mutate_population (tüm nesil)': lambda: mutate_population(population, 1.0, rng),
+    }
+
+    return {name: _micro(func, number, repeat) for name, func in cases.items()}
+
+
 if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        for n in (8, 1000, 10000):
+            print(f"\nN = {n}, popülasyon = 100")
+            for name, micros in benchmark_operators(n=n, number=20 if n > 8 else 200).items():
+                print(f"  {name:<45} {micros:>12.1f} µs")
+        sys.exit(0)
+
     test_population = [
         [4, 2, 7, 3, 6, 8, 5, 1],
         [1, 2, 3, 4, 5, 6, 7, 8],
@@ -73,4 +159,4 @@ if __name__ == "__main__":
     original = [4, 2, 7, 3, 6, 8, 5, 1]
     mutated = mutate(original, mutation_rate=1.0)
     print(f"Orijinal: {original}")
-    print(f"Mutasyon: {mutated}")
\ No newline at end of file
+    print(f"Mutasyon: {mutated}")
@@ -5,6 +5,8 @@ Genotype: 1-8 arası 8 benzersiz sayıdan oluşan permütasyon listesi
 Phenotype: 8x8 satranç tahtasında vezirlerin görsel temsili
 """
 
+import nqueens
+
 def display_board(genotype):
     """
     Bir genotipi (8 sayıdan oluşan liste) alır ve satranç tahtasını yazdırır.
@@ -37,18 +39,9 @@ def display_board(genotype):
     print()
 
 
-def validate_genotype(genotype):
-    """Genotipin geçerli olup olmadığını kontrol eder."""
-    if len(genotype) != 8:
-        return False, "Genotip 8 elemandan oluşmalıdır"
-    
-    if not all(1 <= x <= 8 for x in genotype):
-        return False, "Tüm değerler 1-8 arasında olmalıdır"
-    
-    if len(set(genotype)) != 8:
-        return False, "Tüm değerler benzersiz olmalıdır (permütasyon)"
-    
-    return True, "Geçerli genotip"
+def validate_genotype(genotype, n=8):
+    """Genotipin geçerli olup olmadığını kontrol eder (n=None: herhangi bir N)."""
+    return nqueens.validate_genotype(genotype, n)
 
 
 def count_conflicts(genotype):
@@ -56,22 +49,13 @@ def count_conflicts(genotype):
     Genotipdeki çapraz çatışmaları sayar.
     (Satır ve sütun çatışmaları permütasyon sayesinde zaten yoktur)
     
+    Her çaprazdaki vezir sayısı k için C(k, 2) toplanır: O(N), her N için
+    (bkz. nqueens.py)
+    
     Returns:
         Çapraz çatışma sayısı (0 = çözüm bulundu!)
     """
-    conflicts = 0
-    n = len(genotype)
-    
-    for i in range(n):
-        for j in range(i + 1, n):
-            # Aynı çaprazda mı kontrol et
-            row_diff = abs(genotype[i] - genotype[j])
-            col_diff = abs(i - j)
-            
-            if row_diff == col_diff:
-                conflicts += 1
-    
-    return conflicts
+    return nqueens.count_conflicts(genotype)
 
 
 # Test ve örnek kullanım
@@ -1,6 +1,17 @@
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.colors import ListedColormap, to_rgba_array
+from matplotlib.figure import Figure
+from PIL import Image
+
+from nqueens import count_conflicts
 
 
 def display_board_graphical(genotype, title="8 Vezir Tahtası"):
@@ -64,23 +75,174 @@ def display_board_graphical(genotype, title="8 Vezir Tahtası"):
     return fig
 
 
-def count_conflicts(genotype):
-    """Çapraz çatışmaları sayar."""
-    conflicts = 0
-    n = len(genotype)
+class BoardRenderer:
+    # Toplu çizim: dama deseni bir kez imshow arka planı olarak çizilir ve önbelleğe alınır; her karede
+    # yalnızca vezir işaretlerinin (tek scatter) konumu/rengi ve başlık güncellenir. pyplot kullanılmaz,
+    # figür global kayıt defterine girmez (sızıntı yok). Her N için çalışır.
+    
+    def __init__(self, n=8, size_inches=6.0, dpi=100):
+        self.n = n
+        # Kenar boşlukları (inç): solda/altta etiketler, üstte başlık
+        board = size_inches - 0.6
+        height = board + 0.9
+        self.figure = Figure(figsize=(size_inches, height), dpi=dpi, facecolor='white')
+        self.canvas = FigureCanvasAgg(self.figure)
+        ax = self.figure.add_axes([0.4 / size_inches, 0.35 / height, board / size_inches, board / height])
+        self.ax = ax
+        
+        # Küçük tahtada klasik görünüm (beyaz/siyah kare, kontrast için kırmızı/altın vezir);
+        # büyük N'de açık gri desen üzerinde kırmızı kareler
+        self.glyphs = n <= 32
+        squares = ('white', 'black') if self.glyphs else ('#f4f4f4', '#d0d0d0')
+        self.queen_colors = to_rgba_array(['darkred', 'gold'] if self.glyphs else ['crimson', 'crimson'])
+        
+        # (satır + sütun) çiftse beyaz kare; satır 1 en üstte
+        pattern = np.add.outer(np.arange(n), np.arange(n)) % 2
+        ax.imshow(pattern, cmap=ListedColormap(squares), origin='upper',
+                  extent=(-0.5, n - 0.5, n - 0.5, -0.5), interpolation='nearest')
+        ax.set_xlim(-0.5, n - 0.5)
+        ax.set_ylim(n - 0.5, -0.5)
+        ax.set_aspect('equal')
+        if n <= 20:
+            ax.set_xticks(range(n), [str(i + 1) for i in range(n)], fontsize=9, weight='bold')
+            ax.set_yticks(range(n), [str(i + 1) for i in range(n)], fontsize=9, weight='bold')
+            ax.tick_params(length=0, labeltop=False)
+            for spine in ax.spines.values():
+                spine.set_visible(False)
+        else:
+            ax.axis('off')
+        
+        # Kare kenarı (punto) üzerinden işaret boyu; büyük N'de simge seçilemeyeceği için dolu kare
+        cell = board * 72 / n
+        marker, scale = ('$♛$', 0.8) if self.glyphs else ('s', 1.0)
+        self.queens = ax.scatter([], [], s=(cell * scale) ** 2, marker=marker, linewidths=0,
+                                 animated=True, zorder=3)
+        self.title = self.figure.text(0.5, 0.985, "", ha='center', va='top', fontsize=11, weight='bold',
+                                      animated=True)
+        
+        self.canvas.draw()
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        
+        # Sabit palet: tahtada birkaç renk var; paletli PNG/GIF yazmak RGBA'ya göre kat kat hızlı.
+        # Örnek karede vezirler hem beyaz hem siyah karelerde olsun diye ilk iki satır takaslı
+        sample = np.arange(1, n + 1)
+        sample[:2] = sample[:2][::-1]
+        self.palette = Image.fromarray(self.render(sample, "Nesil 0")).convert('RGB').quantize(colors=64)
+    
+    def render(self, genotype, title=""):
+        # RGBA karesi (yükseklik x genişlik x 4, uint8)
+        rows = np.asarray(genotype) - 1
+        cols = np.arange(len(rows))
+        is_white_square = (rows + cols) % 2 == 0
+        self.queens.set_offsets(np.column_stack([cols, rows]))
+        self.queens.set_facecolor(self.queen_colors[np.where(is_white_square, 0, 1)])
+        self.title.set_text(title)
+        
+        self.canvas.restore_region(self.background)
+        self.ax.draw_artist(self.queens)
+        self.figure.draw_artist(self.title)
+        return np.asarray(self.canvas.buffer_rgba()).copy()
+    
+    def render_image(self, genotype, title=""):
+        # Paletli (P kipinde) PIL görüntüsü
+        image = Image.fromarray(self.render(genotype, title)).convert('RGB')
+        return image.quantize(palette=self.palette, dither=Image.Dither.NONE)
+    
+    def save_png(self, genotype, path, title=""):
+        self.render_image(genotype, title).save(path, compress_level=1)
+
+
+def default_title(genotype, index=None):
+    prefix = "" if index is None else f"Nesil {index} - "
+    return f"{prefix}{len(genotype)} Vezir - Çatışma: {count_conflicts(genotype)}"
+
+
+# İşçi süreç başına tek çizici (ilk karede kurulur), (n, boyut, dpi) anahtarıyla
+_worker_renderer = None
+_worker_key = None
+
+
+def _render_chunk(n, size_inches, dpi, frames, out_dir):
+    global _worker_renderer, _worker_key
+    if _worker_key != (n, size_inches, dpi):
+        _worker_renderer = BoardRenderer(n, size_inches, dpi)
+        _worker_key = (n, size_inches, dpi)
+    images = []
+    for index, genotype, title in frames:
+        if out_dir is None:
+            images.append(_worker_renderer.render_image(genotype, title))
+        else:
+            _worker_renderer.save_png(genotype, os.path.join(out_dir, f"frame_{index:05d}.png"), title)
+    return images
+
+
+def render_history(history, output, titles=None, fps=10, workers=None, size_inches=6.0, dpi=100,
+                   chunk_size=50):
+    # GA geçmişini (nesil başına bir genotip) çizer. output bir dizinse frame_00000.png ... yazılır;
+    # .gif / .mp4 ise kareler işçilerde çizilip burada tek animasyona birleştirilir.
+    history = [np.asarray(genotype) for genotype in history]
+    if not history:
+        return output
+    n = len(history[0])
+    titles = titles or [default_title(genotype, index) for index, genotype in enumerate(history)]
+    extension = os.path.splitext(output)[1].lower()
+    if extension not in ("", ".gif", ".mp4"):
+        raise ValueError(f"Bilinmeyen çıktı biçimi: {extension} (seçenekler: dizin, .gif, .mp4)")
+    out_dir = None
+    if extension == "":
+        os.makedirs(output, exist_ok=True)
+        out_dir = output
     
-    for i in range(n):
-        for j in range(i + 1, n):
-            row_diff = abs(genotype[i] - genotype[j])
-            col_diff = abs(i - j)
-            if row_diff == col_diff:
-                conflicts += 1
+    frames = list(zip(range(len(history)), history, titles))
+    chunks = [frames[i:i + chunk_size] for i in range(0, len(frames), chunk_size)]
+    workers = workers or min(len(chunks), os.cpu_count() or 1)
+    if workers <= 1:
+        images = [image for chunk in chunks for image in _render_chunk(n, size_inches, dpi, chunk, out_dir)]
+    else:
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            results = pool.map(_render_chunk, [n] * len(chunks), [size_inches] * len(chunks),
+                               [dpi] * len(chunks), chunks, [out_dir] * len(chunks))
+            images = [image for chunk in results for image in chunk]
     
-    return conflicts
+    if extension == ".gif":
+        images[0].save(output, save_all=True, append_images=images[1:], duration=int(1000 / fps), loop=0,
+                       optimize=False)
+    elif extension == ".mp4":
+        _write_mp4(images, output, fps, dpi)
+    return output
+
+
+def _write_mp4(images, path, fps, dpi):
+    from matplotlib.animation import FFMpegWriter
+    if not FFMpegWriter.isAvailable():
+        raise ValueError("MP4 için ffmpeg bulunamadı (PNG dizini ya da .gif kullanın)")
+    width, height = images[0].size
+    figure = Figure(figsize=(width / dpi, height / dpi), dpi=dpi)
+    FigureCanvasAgg(figure)
+    ax = figure.add_axes([0, 0, 1, 1])
+    ax.axis('off')
+    artist = ax.imshow(images[0].convert('RGB'))
+    writer = FFMpegWriter(fps=fps)
+    with writer.saving(figure, path, dpi):
+        for image in images:
+            artist.set_data(image.convert('RGB'))
+            writer.grab_frame()
 
 
 # Test ve örnek kullanım
 if __name__ == "__main__":
+    if "--history" in sys.argv:
+        # python eight_queens_visual.py --history N ÇIKTI(.gif | .mp4 | dizin): GA çalıştırmasının her nesli
+        from nqueens_ga import NQueensGA
+        position = sys.argv.index("--history")
+        n, output = int(sys.argv[position + 1]), sys.argv[position + 2]
+        history = []
+        NQueensGA(n, on_generation=lambda generation, genes, fitness: history.append(genes)).solve()
+        render_history(history, output)
+        print(f"✓ {len(history)} kare kaydedildi: {output}")
+        sys.exit(0)
+    
     # Ödevdeki örnek genotip
     genotype = [4, 2, 7, 3, 6, 8, 5, 1]
     
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# Kaan Kara - 220404046
+
+import sys
+import timeit
+
+import numpy as np
+
+
+# Genotip: indeks = sütun (0..N-1), değer = satır (1..N). Permütasyon olduğundan yalnızca çapraz çatışma olabilir.
+# Bir çaprazda k vezir varsa C(k, 2) çift birbirini tehdit eder; sayaçlarla toplam O(N).
+
+# Bu boyutun altında saf Python döngüsü NumPy çağrı yükünden hızlı
+SMALL_N = 64
+
+
+def total_pairs(n):
+    return n * (n - 1) // 2
+
+
+def diagonal_counts(genotype):
+    # (r - c + N - 1) ve (r + c) çaprazlarının doluluk sayaçları, her biri 2N-1 uzunlukta
+    genes = np.asarray(genotype, dtype=np.int64)
+    n = len(genes)
+    cols = np.arange(n)
+    rows = genes - 1
+    diag = np.bincount(rows - cols + n - 1, minlength=2 * n - 1)
+    anti = np.bincount(rows + cols, minlength=2 * n - 1)
+    return diag, anti
+
+
+def _pairs_on(counts):
+    # sum C(k, 2) = (sum k^2 - sum k) / 2
+    counts = counts.astype(np.int64)
+    return int((counts @ counts - counts.sum()) // 2)
+
+
+def count_conflicts(genotype):
+    n = len(genotype)
+    if n <= SMALL_N and not isinstance(genotype, np.ndarray):
+        # Her vezir, çaprazlarında kendinden önce yerleşmiş vezir sayısı kadar çift ekler
+        diag = [0] * (2 * n - 1)
+        anti = [0] * (2 * n - 1)
+        conflicts = 0
+        for col, value in enumerate(genotype):
+            d = value - 1 - col + n - 1
+            a = value - 1 + col
+            conflicts += diag[d] + anti[a]
+            diag[d] += 1
+            anti[a] += 1
+        return conflicts
+
+    diag, anti = diagonal_counts(genotype)
+    return _pairs_on(diag) + _pairs_on(anti)
+
+
+def calculate_fitness(genotype):
+    # Saldırmayan vezir çifti sayısı: C(N, 2) - çatışma
+    return total_pairs(len(genotype)) - count_conflicts(genotype)
+
+
+def count_conflicts_batch(population):
+    # (B x N) popülasyonun tüm satırları tek bincount ile: satır b'nin çaprazları b * (2N-1) kaydırılır
+    population = np.asarray(population, dtype=np.int64)
+    batch, n = population.shape
+    width = 2 * n - 1
+    cols = np.arange(n)[None, :]
+    offset = (np.arange(batch) * width)[:, None]
+    rows = population - 1
+    diag = np.bincount((rows - cols + n - 1 + offset).ravel(), minlength=batch * width).reshape(batch, width)
+    anti = np.bincount((rows + cols + offset).ravel(), minlength=batch * width).reshape(batch, width)
+    # Her satırda iki çapraz ailesinin sayaç toplamı N
+    squares = np.einsum("ij,ij->i", diag, diag) + np.einsum("ij,ij->i", anti, anti)
+    return (squares - 2 * n) // 2
+
+
+def fitness_batch(population):
+    population = np.asarray(population)
+    return total_pairs(population.shape[1]) - count_conflicts_batch(population)
+
+
+def validate_genotype(genotype, n=None):
+    # n verilmezse genotip uzunluğu kullanılır
+    n = len(genotype) if n is None else n
+    if len(genotype) != n:
+        return False, f"Genotip {n} elemandan oluşmalıdır"
+
+    if not all(1 <= x <= n for x in genotype):
+        return False, f"Tüm değerler 1-{n} arasında olmalıdır"
+
+    if len(set(genotype)) != n:
+        return False, "Tüm değerler benzersiz olmalıdır (permütasyon)"
+
+    return True, "Geçerli genotip"
+
+
+def generate_population(size=100, n=8, rng=None):
+    # (size x n) dizi, her satır 1..n permütasyonu
+    rng = rng or np.random.default_rng()
+    return rng.permuted(np.tile(np.arange(1, n + 1), (size, 1)), axis=1)
+
+
+class QueenBoard:
+    # Çapraz sayaçlarıyla tutulan tahta: iki sütunun satırlarını takas etmenin çatışma farkı O(1)
+
+    def __init__(self, genotype):
+        self.genes = np.array(genotype, dtype=np.int64)
+        self.n = len(self.genes)
+        diag, anti = diagonal_counts(self.genes)
+        self.diag = diag.tolist()
+        self.anti = anti.tolist()
+        self.rows = self.genes.tolist()
+        self.conflicts = _pairs_on(diag) + _pairs_on(anti)
+
+    def queen_conflicts(self, col):
+        # col sütunundaki vezirin tehdit ettiği vezir sayısı
+        row = self.rows[col] - 1
+        return self.diag[row - col + self.n - 1] + self.anti[row + col] - 2
+
+    @staticmethod
+    def _moves_delta(counts, removed, added):
+        # Önce çıkarmalar, sonra eklemeler sırayla uygulanır; ortak çaprazlar küçük bir sözlükte izlenir
+        changed = {}
+        delta = 0
+        for key in removed:
+            k = changed.get(key, counts[key])
+            delta -= k - 1
+            changed[key] = k - 1
+        for key in added:
+            k = changed.get(key, counts[key])
+            delta += k
+            changed[key] = k + 1
+        return delta
+
+    def swap_delta(self, i, j):
+        if i == j:
+            return 0
+        n = self.n
+        ri, rj = self.rows[i] - 1, self.rows[j] - 1
+        diag = self._moves_delta(self.diag, (ri - i + n - 1, rj - j + n - 1), (rj - i + n - 1, ri - j + n - 1))
+        anti = self._moves_delta(self.anti, (ri + i, rj + j), (rj + i, ri + j))
+        return diag + anti
+
+    def swap(self, i, j, delta=None):
+        # Takası uygular, çatışma farkını döndürür (swap_delta zaten hesaplandıysa delta verilebilir)
+        if delta is None:
+            delta = self.swap_delta(i, j)
+        if i == j:
+            return delta
+        n = self.n
+        ri, rj = self.rows[i] - 1, self.rows[j] - 1
+        self.diag[ri - i + n - 1] -= 1
+        self.diag[rj - j + n - 1] -= 1
+        self.anti[ri + i] -= 1
+        self.anti[rj + j] -= 1
+        self.diag[rj - i + n - 1] += 1
+        self.diag[ri - j + n - 1] += 1
+        self.anti[rj + i] += 1
+        self.anti[ri + j] += 1
+        self.rows[i], self.rows[j] = self.rows[j], self.rows[i]
+        self.genes[i], self.genes[j] = self.rows[i], self.rows[j]
+        self.conflicts += delta
+        return delta
+
+
+def _pairwise_conflicts(genotype):
+    # Eski O(N^2) sayım; yalnızca karşılaştırma için
+    conflicts = 0
+    n = len(genotype)
+    for i in range(n):
+        for j in range(i + 1, n):
+            if abs(genotype[i] - genotype[j]) == j - i:
+                conflicts += 1
+    return conflicts
+
+
+def _micro(func, number, repeat=5):
+    # Çağrı başına en iyi süre (µs)
+    return min(timeit.repeat(func, repeat=repeat, number=number)) / number * 1e6
+
+
+def benchmark(n=8, population_size=100, repeat=5, number=20):
+    # Çağrı başına en iyi süre (µs)
+    rng = np.random.default_rng(0)
+    population = generate_population(population_size, n, rng)
+    genotype = population[0].tolist()
+    board = QueenBoard(genotype)
+    pairs = rng.integers(0, n, size=(1000, 2)).tolist()
+
+    def deltas():
+        for i, j in pairs:
+            board.swap_delta(i, j)
+
+    cases = {
+        'count_conflicts': lambda: count_conflicts(genotype),
+        'count_conflicts_batch (tüm popülasyon)': lambda: count_conflicts_batch(population),
+        'QueenBoard.swap_delta': lambda: deltas(),
+    }
+    if n <= 1000:
+        cases['O(N^2) ikili sayım'] = lambda: _pairwise_conflicts(genotype)
+
+    results = {name: _micro(func, number, repeat) for name, func in cases.items()}
+    results['QueenBoard.swap_delta'] /= len(pairs)
+    return results
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [8, 1000, 10000]
+    for n in sizes:
+        print(f"\nN = {n}, popülasyon = 100")
+        for name, micros in benchmark(n=n, number=200 if n <= 8 else 5).items():
+            print(f"  {name:<45} {micros:>12.1f} µs")
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# Kaan Kara - 220404046
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "assignment-3"))
+
+from genetic_operators import crossover_population, mutate_population, tournament_selection_indices
+from nqueens import QueenBoard, fitness_batch, generate_population, total_pairs
+
+
+def default_population_size(n):
+    # Büyük N'de bir nesil pahalı: popülasyon N büyüdükçe küçülür (toplam ~2M gen)
+    return int(min(100, max(10, 2_000_000 // max(n, 1))))
+
+
+def min_conflicts(genotype, seed=None, max_passes=None, deadline=None, tries=None):
+    # Çatışmalı her vezir için rastgele sütunlarla takas denenir, çatışmayı azaltan ilk takas uygulanır.
+    # Takas farkı çapraz sayaçlarından O(1). Dönüş: (genotip listesi, kalan çatışma, geçiş sayısı)
+    board = QueenBoard(genotype)
+    n = board.n
+    rnd = random.Random(seed)
+    randrange = rnd.randrange
+    tries = tries or 32
+    passes = 0
+    while board.conflicts > 0 and n > 3:
+        if max_passes is not None and passes >= max_passes:
+            break
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+        passes += 1
+        improved = False
+        for i in range(n):
+            if board.queen_conflicts(i) == 0:
+                continue
+            for _ in range(tries):
+                j = randrange(n)
+                delta = board.swap_delta(i, j)
+                if delta < 0:
+                    board.swap(i, j, delta)
+                    improved = True
+                    break
+            if board.conflicts == 0:
+                break
+        if not improved:
+            # Yerel minimum: çatışmalı bir vezir rastgele bir sütunla takas edilir (yan hamle)
+            conflicted = [i for i in range(n) if board.queen_conflicts(i) > 0]
+            board.swap(rnd.choice(conflicted), randrange(n))
+    return board.rows, board.conflicts, passes
+
+
+class NQueensGA:
+    # Nesilsel GA (turnuva seçimi + tek noktalı sıralı çaprazlama + takas mutasyonu + elitizm);
+    # son patience nesilde en iyi bireyin çatışması min_gain oranından az azaldıysa (plato) en iyi birey
+    # min-conflicts ile tamamlanır
+
+    def __init__(self, n, population_size=None, elite=2, mutation_rate=0.2, tournament_size=3,
+                 patience=10, min_gain=0.05, max_generations=1000, seed=None, on_generation=None):
+        if n < 1:
+            raise ValueError(f"Geçersiz tahta boyutu: {n}")
+        self.n = n
+        self.population_size = population_size or default_population_size(n)
+        self.elite = elite
+        self.mutation_rate = mutation_rate
+        self.tournament_size = tournament_size
+        self.patience = patience
+        self.min_gain = min_gain
+        self.max_generations = max_generations
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        # on_generation(nesil, en iyi genotip, uygunluk): her nesilde ve min-conflicts sonrasında çağrılır
+        self.on_generation = on_generation
+        self.target = total_pairs(n)
+
+    def evolve(self, deadline=None):
+        # Dönüş: (en iyi genotip, uygunluğu, nesil sayısı)
+        population = generate_population(self.population_size, self.n, self.rng)
+        fitness = fitness_batch(population)
+        best = int(np.argmax(fitness))
+        best_fitness = int(fitness[best])
+        best_genes = population[best].copy()
+        # Nesil başına en iyi çatışma sayısı (plato tespiti için)
+        history = [self.target - best_fitness]
+        generation = 0
+        if self.on_generation:
+            self.on_generation(generation, best_genes, best_fitness)
+        n_children = self.population_size - self.elite
+
+        while (best_fitness < self.target and not self._plateau(history) and generation < self.max_generations
+               and self.n > 1 and (deadline is None or time.perf_counter() < deadline)):
+            elite_rows = np.argpartition(-fitness, self.elite - 1)[:self.elite] if self.elite else []
+            parents = tournament_selection_indices(fitness, 2 * n_children, self.tournament_size, self.rng)
+            children = crossover_population(population[parents[:n_children]], population[parents[n_children:]],
+                                            self.rng)
+            mutate_population(children, self.mutation_rate, self.rng)
+            population = np.concatenate([population[elite_rows], children])
+            fitness = fitness_batch(population)
+            generation += 1
+
+            best = int(np.argmax(fitness))
+            if fitness[best] > best_fitness:
+                best_fitness = int(fitness[best])
+                best_genes = population[best].copy()
+            history.append(self.target - best_fitness)
+            if self.on_generation:
+                self.on_generation(generation, best_genes, best_fitness)
+
+        return best_genes, best_fitness, generation
+
+    def _plateau(self, history):
+        if len(history) <= self.patience:
+            return False
+        before = history[-1 - self.patience]
+        return before - history[-1] < self.min_gain * before
+
+    def solve(self, time_limit=None):
+        start = time.perf_counter()
+        deadline = None if time_limit is None else start + time_limit
+        genes, fitness, generations = self.evolve(deadline)
+        ga_seconds = time.perf_counter() - start
+
+        passes = 0
+        if fitness < self.target:
+            genes, conflicts, passes = min_conflicts(genes, self.seed, deadline=deadline)
+            fitness = self.target - conflicts
+            if self.on_generation:
+                self.on_generation(generations + 1, np.array(genes), fitness)
+        seconds = time.perf_counter() - start
+        return {
+            'n': self.n,
+            'solution': np.asarray(genes).tolist() if fitness == self.target else None,
+            'conflicts': self.target - fitness,
+            'generations': generations,
+            'min_conflicts_passes': passes,
+            'ga_seconds': ga_seconds,
+            'local_seconds': seconds - ga_seconds,
+            'seconds': seconds,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="N-vezir: GA + min-conflicts, çözüme ulaşma süresi")
+    parser.add_argument("sizes", nargs="*", type=int, default=[8, 100, 1000, 10000, 100000])
+    parser.add_argument("--population", type=int, default=None)
+    parser.add_argument("--patience", type=int, default=10)
+    parser.add_argument("--min-gain", type=float, default=0.05,
+                        help="patience nesilde çatışmadaki en az göreli azalma; altında min-conflicts'e geçilir")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--time-limit", type=float, default=None, help="Boyut başına saniye")
+    args = parser.parse_args()
+
+    print(f"{'N':>8} {'nesil':>6} {'GA sn':>8} {'MC geçiş':>9} {'MC sn':>8} {'toplam sn':>10}  sonuç")
+    for n in args.sizes:
+        result = NQueensGA(n, population_size=args.population, patience=args.patience,
+                           min_gain=args.min_gain, seed=args.seed).solve(args.time_limit)
+        status = "çözüldü" if result['solution'] is not None else f"{result['conflicts']} çatışma"
+        print(f"{n:>8} {result['generations']:>6} {result['ga_seconds']:>8.3f} {result['min_conflicts_passes']:>9} "
+              f"{result['local_seconds']:>8.3f} {result['seconds']:>10.3f}  {status}")
+        if n == 8 and result['solution'] is not None:
+            from eight_queens import display_board
+            display_board(result['solution'])
+
+
+if __name__ == "__main__":
+    main()